@@ -36,14 +36,12 @@ class DAG(nx.DiGraph):
                     if tool_wrapper1.follows(tool_wrapper2):
                         self.add_edge(tool_wrapper2, tool_wrapper1)
         if tool_wrapper_set:
-            # for each tool
-            for tool_wrapper1 in tool_wrapper_set:
-                self.dot_digraph.add_node(tool_wrapper1.dot_label())
-                # for each other tool
-                for tool_wrapper2 in tool_wrapper_set.difference(set([tool_wrapper1])):
-                    # is there a dependency between tool1 and tool2?
-                    if tool_wrapper1.follows(tool_wrapper2):
-                        self.dot_digraph.add_edge(tool_wrapper2.dot_label(), tool_wrapper1.dot_label())
+            # the dot graph has the same dependencies than the DAG: they are not computed again with follows() and the
+            # label of each tool is computed once
+            dict_tool_wrapper_to_dot_label = {tool_wrapper: tool_wrapper.dot_label() for tool_wrapper in tool_wrapper_set}
+            self.dot_digraph.add_nodes_from(dict_tool_wrapper_to_dot_label.values())
+            self.dot_digraph.add_edges_from((dict_tool_wrapper_to_dot_label[tool_wrapper2], dict_tool_wrapper_to_dot_label[tool_wrapper1])
+                                            for tool_wrapper2, tool_wrapper1 in self.edges())
         Logger.instance().debug("DAG built.")
 
     def write_dot(self, path):
@@ -2,10 +2,12 @@
 Module containing the Parser class
 """
 
+from sqlalchemy.orm import selectinload
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.sql.functions import func
 
 from wopmars.SQLManager import SQLManager
+from wopmars.models.TableInputOutputInformation import TableInputOutputInformation
 from wopmars.models.ToolWrapper import ToolWrapper
 from wopmars.DAG import DAG
 from wopmars.Reader import Reader
@@ -87,7 +89,15 @@ class Parser:
             execution_id = session.query(func.max(ToolWrapper.execution_id)).first()[0]
             # Logger.instance().debug("Getting toolwrappers of the current execution. id = " + str(execution_id.one()[0]))
             Logger.instance().debug("Getting toolwrappers of the current execution. id = " + str(execution_id))
-            set_toolwrappers = set(session.query(ToolWrapper).filter(ToolWrapper.execution_id == execution_id).all())
+            # the relations walked while building the DAG are loaded with one query per relation for all the toolwrappers
+            # instead of one query per toolwrapper and per relation. The types of the files and tables are not loaded:
+            # the partition by type reads the is_input column of the loaded rows
+            set_toolwrappers = set(session.query(ToolWrapper).options(
+                selectinload(ToolWrapper.relation_toolwrapper_to_fileioinfo),
+                selectinload(ToolWrapper.relation_toolwrapper_to_tableioinfo)
+                .selectinload(TableInputOutputInformation.relation_tableioinfo_to_tablemodiftime),
+                selectinload(ToolWrapper.relation_toolwrapper_to_option))
+                .filter(ToolWrapper.execution_id == execution_id).all())
         except NoResultFound as e:
             raise e
         return set_toolwrappers
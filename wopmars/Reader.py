@@ -1,16 +1,22 @@
+import copy
+import functools
 import importlib
+import logging
 import re
 import os
 
+from ast import literal_eval
+from collections import Counter
+
 import yaml
 from yaml.constructor import ConstructorError
 
 from wopmars.utils.various import get_current_time
 
 try:
-    from yaml import CLoader as Loader
+    from yaml import CSafeLoader as SafeLoader
 except ImportError:
-    from yaml import Loader
+    from yaml import SafeLoader
 
 from sqlalchemy.orm.exc import NoResultFound, ObjectDeletedError
 
@@ -26,6 +32,97 @@ from wopmars.utils.Logger import Logger
 from wopmars.utils.OptionManager import OptionManager
 from wopmars.utils.WopMarsException import WopMarsException
 
+# recognize the rule names in the raw content of the definition file: only the lines declaring a rule are matched
+_RULE_RE = re.compile(r'^rule\s+(\S+?)\s*:\s*$', re.MULTILINE)
+
+# recognize the rule blocks
+_STEP1_RE = re.compile(r"rule [^\s]+$")
+
+# the elements of the rule
+_ALLOWED_STEP2 = frozenset({"params", "tool", "input", "output"})
+
+# the elements of the rule which contain file/table blocks
+_INPUT_OR_OUTPUT = frozenset({"input", "output"})
+
+# the file/table blocks
+_ALLOWED_STEP3 = frozenset({"file", "table"})
+
+# the tag of the yaml merge keys "<<", which are not duplicates of the keys they are merged with
+_YAML_MERGE_TAG = "tag:yaml.org,2002:merge"
+
+# the example given in the grammar error messages
+_EXEMPLE_FILE_DEF = """
+    rule RULENAME:
+        tool: TOOLNAME
+        input:
+            file:
+                INPUTNAME: INPUTVALUE
+            table:
+                TABLENAME: path.to.table
+        output:
+            file:
+                OUTPUTNAME: OUTPUTVALUE
+            table:
+                TABLENAME: path.to.table
+        params:
+            OPTIONNAME: OPTIONVALUE
+
+    rule ...etc...
+        """
+
+
+class WopfileLoader(SafeLoader):
+    """
+    The ``yaml`` loader used to read the workflow definition file.
+
+    It is the libyaml-backed ``CSafeLoader`` when available (``SafeLoader`` otherwise) and refuses duplicate keys on the
+    same level of hierarchy thanks to :meth:`~.wopmars.Reader.Reader.no_duplicates_constructor`. The constructor is
+    registered on this subclass so that the other users of the ``yaml`` loaders are not affected.
+    """
+    pass
+
+
+@functools.lru_cache(maxsize=64)
+def _load_wopfile(wopfile_path, mtime_ns, size):
+    """
+    Load the definition file with the :class:`~.wopmars.Reader.WopfileLoader`.
+
+    The result is memoized on the path, the modification time and the size of the file so that the same unchanged
+    definition file is parsed only once per process. The returned dict is shared by every caller: it must not be
+    modified, :meth:`~.wopmars.Reader.Reader.load_wopfile_as_yml_dic` works on a deep copy of it.
+
+    :param wopfile_path: Path to the definition file
+    :type wopfile_path: str
+    :param mtime_ns: The modification time of the file, in nanoseconds
+    :type mtime_ns: int
+    :param size: The size of the file, in bytes
+    :type size: int
+    :return: dict
+    """
+    with open(wopfile_path, 'r') as def_file:
+        # yaml.load return None if there is no content in the String
+        return yaml.load(def_file, Loader=WopfileLoader) or {}
+
+
+class RuleParts:
+    """
+    The inputs, outputs and params of a rule, as they are read before the creation of its tool wrapper.
+
+    The files and tables are kept in flat lists, in the order of the definition file, in place of the former
+    ``dict(dict_input={"file": {}, "table": {}}, dict_params={}, dict_output={"file": {}, "table": {}})``.
+    """
+    __slots__ = ("input_files", "input_tables", "output_files", "output_tables", "params")
+
+    def __init__(self):
+        # FileInputOutputInformation objects
+        self.input_files = []
+        # TableInputOutputInformation objects
+        self.input_tables = []
+        self.output_files = []
+        self.output_tables = []
+        # Option objects
+        self.params = []
+
 
 class Reader:
     """
@@ -42,6 +139,8 @@ class Reader:
     """
     def __init__(self):
         self.__wopfile_yml_dict = None
+        # the tool wrapper modules already imported, by python path
+        self.__dict_tool_wrapper_modules = {}
 
     def load_wopfile_as_yml_dic(self, wopfile_path):
         """
@@ -58,23 +157,22 @@ class Reader:
         """
         # Tests about grammar and syntax are performed here (file's existence is also tested here)
         try:
-            with open(wopfile_path, 'r') as def_file:
-                wopfile_content_str = def_file.read()
+            wopfile_stat = os.stat(wopfile_path)
             try:
-                # The workflow definition file is loaded as-it in memory by the pyyaml library
+                # The workflow definition file is streamed to the pyyaml library, once per version of the file
                 Logger.instance().info("Reading the Wopfile.yml: " + str(wopfile_path))
                 # Replace jinja2 variables with environment variable values
                 #s_def_file_content = jinja2.Environment().from_string(s_def_file_content).render(os.environ)
-                # Parse the file to find duplicates rule names (it is a double check with the following step)
-                Reader.check_duplicate_rules(wopfile_content_str)
-                # Allows to raise an exception if duplicate keys are found on the same document hirearchy level.
-                yaml.add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, Reader.no_duplicates_constructor)
-                # The whole content of the definition file is loaded in this dict.
-                # yaml.load return None if there is no content in the String
-                self.__wopfile_yml_dict = yaml.load(wopfile_content_str, Loader=yaml.SafeLoader) or {}
+                # The whole content of the definition file is loaded in this dict. Duplicate rule names are
+                # duplicate keys of the first level, so they are refused by the WopfileLoader during the load.
+                # It is not loaded again as long as the file is unchanged, each Reader gets its own copy of the cached
+                # dict so that a modification of it can not alter the later loads.
+                self.__wopfile_yml_dict = copy.deepcopy(_load_wopfile(os.path.abspath(wopfile_path),
+                                                                      wopfile_stat.st_mtime_ns, wopfile_stat.st_size))
                 if self.__wopfile_yml_dict == {}:
                     Logger.instance().warning("The workflow definition file is empty")
-                Logger.instance().debug("\n" + DictUtils.pretty_repr(self.__wopfile_yml_dict))
+                if Logger.instance().is_enabled_for(logging.DEBUG):
+                    Logger.instance().debug("\n" + DictUtils.pretty_repr(self.__wopfile_yml_dict))
                 Logger.instance().debug("Read complete.")
                 Logger.instance().debug("Checking whether the file is well formed...")
                 # raise an exception if there is a problem with the grammar
@@ -96,15 +194,20 @@ class Reader:
     def no_duplicates_constructor(loader, node, deep=False):
         """
         Make the yaml constructor to check for duplicate keys.
+
+        The keys of the node are scanned before the mapping is constructed, because construct_mapping flattens the
+        ``<<`` merge keys into the node: the entries of a merge may be overridden by the keys of the mapping. Only the
+        keys are constructed by the scan, the values are constructed once by construct_mapping which reuses the keys.
         """
-        mapping = {}
+        seen = set()
         for key_node, value_node in node.value:
+            if key_node.tag == _YAML_MERGE_TAG:
+                continue
             key = loader.construct_object(key_node, deep=deep)
-            value = loader.construct_object(value_node, deep=deep)
-            if key in mapping:
+            if key in seen:
                 raise ConstructorError("while constructing a mapping", node.start_mark,
                                        "found duplicate key (%s)" % key, key_node.start_mark)
-            mapping[key] = value
+            seen.add(key)
         return loader.construct_mapping(node, deep)
 
     @staticmethod
@@ -136,21 +239,21 @@ class Reader:
         :type wopfile_content_str: str
         :raises WopMarsException: There is a duplicate rule is_input
         """
-        Logger.instance().debug("Looking for duplicate rules...")
+        logger = Logger.instance()
+        is_debug = logger.is_enabled_for(logging.DEBUG)
+        if is_debug:
+            logger.debug("Looking for duplicate rules...")
         # All rules are found using this regex.
-        rules = re.findall(r'rule (.+?):', str(wopfile_content_str))
-        seen = set()
-        # for each rule is_input
-        for r in rules:
-            # if the rule has not been seen before
-            if r not in seen:
-                # add it to the set of seen rules
-                seen.add(r)
-            else:
-                # There is a duplicate rule is_input
-                raise WopMarsException("Error while parsing the configuration file:\n\t",
-                                       "The rule " + r + " is duplicated.")
-        Logger.instance().debug("No Duplicate.")
+        rules = _RULE_RE.findall(wopfile_content_str)
+        # the set is smaller than the list only if a rule name appears more than once
+        if len(set(rules)) == len(rules):
+            if is_debug:
+                logger.debug("No Duplicate.")
+            return
+        # There is a duplicate rule is_input
+        r = next(k for k, v in Counter(rules).items() if v > 1)
+        raise WopMarsException("Error while parsing the configuration file:\n\t",
+                               "The rule " + r + " is duplicated.")
 
     def is_grammar_respected(self):
         """
@@ -174,101 +277,104 @@ class Reader:
 
         :raises WopMarsException: The grammar is not respected
         """
-        exemple_file_def = """
-    rule RULENAME:
-        tool: TOOLNAME
-        input:
-            file:
-                INPUTNAME: INPUTVALUE
-            table:
-                - path.to.table
-        output:
-            file:
-                OUTPUTNAME: OUTPUTVALUE
-            table:
-                - path.to.table
-        params:
-            OPTIONNAME: OPTIONVALUE
-
-    rule ...etc...
-        """
-        # recognize the rule blocks
-        regex_step1 = re.compile(r"(^rule [^\s]+$)")
-
-        # recognize the elements of the rule
-        regex_step2 = re.compile(r"(^params$)|(^tool$)|(^input$)|(^output$)")
-
-        # recognize the file/table blocks
-        regex_step3 = re.compile(r"(^file$)|(^table$)")
-
-        # The words found are tested against the regex to see if they match or not
-        for s_key_step1 in self.__wopfile_yml_dict:
+        # The words found are tested against the regex to see if they match or not. Each level is checked to be a
+        # mapping before walking its items, a malformed block raises a grammar exception instead of an AttributeError
+        if not isinstance(self.__wopfile_yml_dict, dict):
+            raise Reader.__not_a_mapping_exception(self.__wopfile_yml_dict, None, "a list of rules")
+        for s_key_step1, dict_step2 in self.__wopfile_yml_dict.items():
             bool_toolwrapper = False
             # The first level of indentation should only contain rules
-            if not regex_step1.search(s_key_step1):
+            if not _STEP1_RE.match(s_key_step1):
                 raise WopMarsException("Error while parsing the configuration file: \n\t"
                                        "The grammar of the WopMars's definition file is not respected:",
                                        "The line containing:\'" +
                                        str(s_key_step1) +
                                        "\' doesn't match the grammar: it should start with 'rule'" +
                                        "and contains only one word after the 'rule' keyword" +
-                                       "\nexemple:" + exemple_file_def)
+                                       "\nexemple:" + _EXEMPLE_FILE_DEF)
+            if not isinstance(dict_step2, dict):
+                raise Reader.__not_a_mapping_exception(s_key_step1, None,
+                                                       "'tool', 'params', 'input' or 'output' blocks")
 
-            for s_key_step2 in self.__wopfile_yml_dict[s_key_step1]:
+            for s_key_step2, dict_step3 in dict_step2.items():
                 # the second level of indentation should only contain elements of rule
-                if not regex_step2.search(s_key_step2):
+                if s_key_step2 not in _ALLOWED_STEP2:
                     raise WopMarsException("Error while parsing the configuration file: \n\t"
                                            "The grammar of the WopMars's definition file is not respected:",
                                            "The line containing:'" + str(s_key_step2) + "'" +
                                            " for rule '" + str(s_key_step1) + "'" +
                                            " doesn't match the grammar: it should be " +
                                            "'tool', 'params', 'input' or 'output'" +
-                                           "\nexemple:" + exemple_file_def)
-                elif s_key_step2 == "input" or s_key_step2 == "output":
-                    for s_key_step3 in self.__wopfile_yml_dict[s_key_step1][s_key_step2]:
-                        if not regex_step3.search(s_key_step3):
+                                           "\nexemple:" + _EXEMPLE_FILE_DEF)
+                # There should be one tool at max in each rule
+                elif s_key_step2 == "tool":
+                    if bool_toolwrapper:
+                        raise WopMarsException("Error while parsing the configuration file: \n\t",
+                                               "There is multiple tools specified for the " + str(s_key_step1))
+                    bool_toolwrapper = True
+                elif s_key_step2 == "params":
+                    if not isinstance(dict_step3, dict):
+                        raise Reader.__not_a_mapping_exception(s_key_step2, s_key_step1, "the names of the options")
+                elif s_key_step2 in _INPUT_OR_OUTPUT:
+                    if not isinstance(dict_step3, dict):
+                        raise Reader.__not_a_mapping_exception(s_key_step2, s_key_step1, "'file' or 'table' blocks")
+                    for s_key_step3, dict_file_or_table in dict_step3.items():
+                        if s_key_step3 not in _ALLOWED_STEP3:
                             raise WopMarsException("Error while parsing the configuration file: \n\t"
                                                    "The grammar of the WopMars's definition file is not respected:",
                                                    "The line containing:'" + str(s_key_step3) + "'" +
                                                    " for rule '" + str(s_key_step1) + "'" +
                                                    " doesn't match the grammar: it should be " +
                                                    "'file' or 'table'" +
-                                                   "\nexemple:" + exemple_file_def)
+                                                   "\nexemple:" + _EXEMPLE_FILE_DEF)
+                        elif not isinstance(dict_file_or_table, dict):
+                            raise Reader.__not_a_mapping_exception(s_key_step3, s_key_step1,
+                                                                   "the keys of the " + s_key_step3 + "s")
                         elif s_key_step3 == "file":
-                            for s_variable_name in self.__wopfile_yml_dict[s_key_step1][s_key_step2][s_key_step3]:
-                                if type(self.__wopfile_yml_dict[s_key_step1][s_key_step2][s_key_step3][s_variable_name]) != str:
+                            for s_variable_name, s_path in dict_file_or_table.items():
+                                if not isinstance(s_path, str):
                                     raise WopMarsException("Error while parsing the configuration file: \n\t" +
                                                            "The grammar of the WopMars's definition file is not respected:",
                                                            "The line containing:'" + str(s_variable_name) + "'" +
                                                            " for rule '" + str(s_key_step1) + "'" +
                                                            " doesn't match the grammar: it should be the string containing the path to the file."
-                                                           "\nexemple:" + exemple_file_def)
+                                                           "\nexemple:" + _EXEMPLE_FILE_DEF)
                         elif s_key_step3 == "table":
-                            for s_tablename in self.__wopfile_yml_dict[s_key_step1][s_key_step2][s_key_step3]:
-                                if type(s_tablename) != str:
+                            for s_tablename, s_model_py_path in dict_file_or_table.items():
+                                if not isinstance(s_model_py_path, str):
                                     raise WopMarsException("Error while parsing the configuration file: \n\t"
                                                            "The grammar of the WopMars's definition file is not respected:",
-                                                           "The line containing:'" + str(s_variable_name) + "'" +
+                                                           "The line containing:'" + str(s_tablename) + "'" +
                                                            " for rule '" + str(s_key_step1) + "'" +
                                                            " doesn't match the grammar: it should be the string containing the is_input of the Model."
-                                                           "\nexemple:" + exemple_file_def)
-
-                # There should be one tool at max in each rule
-                elif s_key_step2 == "tool":
-                    if bool_toolwrapper == False:
-                        bool_toolwrapper = True
-                    elif bool_toolwrapper == True:
-                        raise WopMarsException("Error while parsing the configuration file: \n\t",
-                                               "There is multiple tools specified for the " + str(s_key_step1))
+                                                           "\nexemple:" + _EXEMPLE_FILE_DEF)
 
             # All rules should contain a tool
             if not bool_toolwrapper:
                 raise WopMarsException("Error while parsing the configuration file: \n\t"
                                        "The grammar of the WopMars's definition file is not respected:",
                                        "The rule '" + str(s_key_step1) + "' doesn't contain any tool." +
-                                       "\nexemple:" + exemple_file_def
+                                       "\nexemple:" + _EXEMPLE_FILE_DEF
                                        )
 
+    @staticmethod
+    def __not_a_mapping_exception(s_line, s_rule, s_expected):
+        """
+        Build the grammar exception raised when a block of the definition file is not a mapping, ie: a string or a list.
+
+        :param s_line: The key of the block which is not a mapping
+        :param s_rule: The rule containing the block, None for the whole file
+        :param s_expected: What the block should contain, for the message
+        :type s_expected: str
+        :return: :class:`~.wopmars.utils.WopMarsException.WopMarsException`
+        """
+        s_rule_part = "" if s_rule is None else " for rule '" + str(s_rule) + "'"
+        return WopMarsException("Error while parsing the configuration file: \n\t"
+                                "The grammar of the WopMars's definition file is not respected:",
+                                "The line containing:'" + str(s_line) + "'" + s_rule_part +
+                                " doesn't match the grammar: it should contain " + s_expected +
+                                "\nexemple:" + _EXEMPLE_FILE_DEF)
+
     def load_one_toolwrapper(self, s_toolwrapper, s_dict_inputs, s_dict_outputs, s_dict_params):
         """
         Method called when the ``tool`` command is used. It is equivalent to the :meth:`~.wopmars.framework.parsing.Reader.Reader.iterate_wopfile_yml_dic_and_insert_rules_in_db` method but create a workflow
@@ -286,9 +392,9 @@ class Reader:
         :raise WopMarsException: There is an error while accessing the database
         """
         session = SQLManager.instance().get_session()
-        dict_inputs = dict(eval(s_dict_inputs))
-        dict_outputs = dict(eval(s_dict_outputs))
-        dict_params = dict(eval(s_dict_params))
+        dict_inputs = dict(literal_eval(s_dict_inputs))
+        dict_outputs = dict(literal_eval(s_dict_outputs))
+        dict_params = dict(literal_eval(s_dict_params))
         try:
             # The same execution entry for the whole workflow-related database entries.
             time_unix_ms, time_human = get_current_time()
@@ -297,51 +403,48 @@ class Reader:
             input_entry = session.query(TypeInputOrOutput).filter(TypeInputOrOutput.is_input == True).one()
             output_entry = session.query(TypeInputOrOutput).filter(TypeInputOrOutput.is_input == False).one()
 
-            Logger.instance().debug("Loading unique tool_python_path " + s_toolwrapper)
-            dict_dict_dict_elm = dict(dict_input={"file": {}, "table": {}},
-                                 dict_params={},
-                                 dict_output={"file": {}, "table": {}})
-            for type in dict_inputs:
+            logger = Logger.instance()
+            logger.debug("Loading unique tool_python_path %s", s_toolwrapper)
+            rule_parts = RuleParts()
+            base_dir = OptionManager.instance()["--directory"]
+            for type, dict_file_or_table in dict_inputs.items():
                 if type == "file":
-                    for s_input in dict_inputs[type]:
+                    for s_input, s_path in dict_file_or_table.items():
                         obj_created = FileInputOutputInformation(file_key=s_input,
-                                                                 path=os.path.join(OptionManager.instance()["--directory"],
-                                                                                  dict_inputs[type][s_input]))
-                        dict_dict_dict_elm["dict_input"][type][s_input] = obj_created
-                        Logger.instance().debug("Object input file: " + s_input + " created.")
+                                                                 path=os.path.join(base_dir, s_path))
+                        rule_parts.input_files.append(obj_created)
+                        logger.debug("Object input file: %s created.", s_input)
                 elif type == "table":
-                    for s_input in dict_inputs[type]:
-                        model_py_path = dict_inputs[type][s_input]
+                    for s_input, model_py_path in dict_file_or_table.items():
                         table_name = model_py_path.split('.')[-1]
                         obj_created = TableInputOutputInformation(model_py_path=model_py_path, table_key=s_input,
                                                                   table_name=table_name)
-                        dict_dict_dict_elm["dict_input"][type][s_input] = obj_created
-                        Logger.instance().debug("Object input table: " + s_input + " created.")
-            for type in dict_outputs:
+                        rule_parts.input_tables.append(obj_created)
+                        logger.debug("Object input table: %s created.", s_input)
+            for type, dict_file_or_table in dict_outputs.items():
                 if type == "file":
-                    for s_output in dict_outputs[type]:
-                        obj_created = FileInputOutputInformation(file_key=s_output, path=dict_outputs[type][s_output])
-                        dict_dict_dict_elm["dict_output"]["file"][s_output] = obj_created
-                        Logger.instance().debug("Object output file: " + s_output + " created.")
+                    for s_output, s_path in dict_file_or_table.items():
+                        obj_created = FileInputOutputInformation(file_key=s_output, path=s_path)
+                        rule_parts.output_files.append(obj_created)
+                        logger.debug("Object output file: %s created.", s_output)
                 elif type == "table":
-                    for s_output in dict_outputs[type]:
-                        model_py_path = dict_outputs[type][s_output]
+                    for s_output, model_py_path in dict_file_or_table.items():
                         table_name = model_py_path.split('.')[-1]
                         obj_created = TableInputOutputInformation(model_py_path=model_py_path, table_key=s_output,
                                                                   table_name=table_name)
-                        dict_dict_dict_elm["dict_output"]["table"][s_output] = obj_created
-                        Logger.instance().debug("Object output table: " + s_output + " created.")
-            for s_param in dict_params:
-                obj_created = Option(name=s_param,
-                                     value=dict_params[s_param])
-                dict_dict_dict_elm["dict_params"][s_param] = obj_created
-                Logger.instance().debug("Object option: " + s_param + " created.")
+                        rule_parts.output_tables.append(obj_created)
+                        logger.debug("Object output table: %s created.", s_output)
+            for s_param, value in dict_params.items():
+                obj_created = Option(name=s_param, value=value)
+                rule_parts.params.append(obj_created)
+                logger.debug("Object option: %s created.", s_param)
 
             # Instantiate the refered class
             wrapper_entry = self.create_tool_wrapper_inst("rule_" + s_toolwrapper, s_toolwrapper,
-                                                          dict_dict_dict_elm, input_entry, output_entry)
+                                                          rule_parts, input_entry, output_entry,
+                                                          (time_unix_ms, time_human))
             wrapper_entry.relation_toolwrapper_to_execution = execution
-            Logger.instance().debug("Object tool_python_path: " + s_toolwrapper + " created.")
+            logger.debug("Object tool_python_path: %s created.", s_toolwrapper)
             session.add(wrapper_entry)
             session.commit()
             session.rollback()
@@ -385,83 +488,60 @@ class Reader:
             # get the types database entries that should have been created previously
             input_entry = session.query(TypeInputOrOutput).filter(TypeInputOrOutput.is_input == True).one()
             output_entry = session.query(TypeInputOrOutput).filter(TypeInputOrOutput.is_input == False).one()
-            tool_wrapper_set = set()
+            tool_wrapper_list = []
+            logger = Logger.instance()
             # Encounter a rule block
-            for yml_key_level1 in self.__wopfile_yml_dict:
+            for yml_key_level1, yml_rule_dict in self.__wopfile_yml_dict.items():
                 tool_wrapper_py_path = None
                 # the is_input of the rule is extracted after the "rule" keyword. There shouldn't be a ":" but it costs nothing.
                 rule_name_str = yml_key_level1.split()[-1].strip(":")
-                Logger.instance().debug("Encounter rule " + rule_name_str + ": \n" +
-                                        str(DictUtils.pretty_repr(self.__wopfile_yml_dict[yml_key_level1])))
-                # The dict of "input"s, "output"s and "params" is re-initialized for each tool wrapper
-                tool_wrapper_inst_dic = dict(dict_input={"file": {}, "table": {}}, dict_params={}, dict_output={"file": {}, "table": {}})
-                for yml_key_level2 in self.__wopfile_yml_dict[yml_key_level1]:
+                if logger.is_enabled_for(logging.DEBUG):
+                    logger.debug("Encounter rule %s: \n%s", rule_name_str, DictUtils.pretty_repr(yml_rule_dict))
+                # The "input"s, "output"s and "params" are re-initialized for each tool wrapper
+                rule_parts = RuleParts()
+                for yml_key_level2, yml_value_level2 in yml_rule_dict.items():
                     # key_second_step is supposed to be "tool", "input", "output" or "params"
-                    # if type(self.__wopfile_yml_dict[rule_header][yml_key_level_2nd]) == dict:
-                    if yml_key_level2 in {"input", "output", "params"}:
-                        # if it is a dict, then inputs, outputs or params are coming
-                        for yml_key_level3 in self.__wopfile_yml_dict[yml_key_level1][yml_key_level2]:
-                            if yml_key_level2 == "params":
-                                # yml_key = yml_key_level3
-                                value = self.__wopfile_yml_dict[yml_key_level1][yml_key_level2][yml_key_level3]
-                                option_inst = Option(name=yml_key_level3, value=value)
-                                tool_wrapper_inst_dic["dict_params"][yml_key_level3] = option_inst
-                            else: # file or table
-                                for yml_key_level4 in self.__wopfile_yml_dict[yml_key_level1][yml_key_level2][yml_key_level3]:
-                                    file_or_table_inst = None
-                                    if yml_key_level3 == "file":
-                                        # yml_key = yml_key_level4
-                                        # str_path_to_file = os.path.join(OptionManager.instance()["--directory"],
-                                        #                                 self.__wopfile_yml_dict[rule][
-                                        #                                     key_second_step][key_third_step][key])
-                                        str_path_to_file = self.__wopfile_yml_dict[yml_key_level1][yml_key_level2][yml_key_level3][yml_key_level4]
-                                        file_or_table_inst = FileInputOutputInformation(file_key=yml_key_level4, path=str_path_to_file)
-
-                                    elif yml_key_level3 == "table":
-                                        yml_key = yml_key_level4
-                                        modelname = self.__wopfile_yml_dict[yml_key_level1][yml_key_level2][
-                                            yml_key_level3][
-                                            yml_key]
-                                        model_py_path = modelname
-                                        table_name = model_py_path.split('.')[-1]
-                                        file_or_table_inst = TableInputOutputInformation(model_py_path=model_py_path,
-                                                                                  table_key=yml_key_level4, table_name=table_name)
-
-                                    # all elements of the current rule block are stored in there
-                                    # key_second_step is input or output here
-                                    # tool_wrapper_inst_dic["dict_" + yml_key_level2][yml_key_level3][yml_key] = obj_created
-                                    tool_wrapper_inst_dic["dict_" + yml_key_level2][yml_key_level3][yml_key_level4] \
-                                        = file_or_table_inst
-                                    Logger.instance().debug("Object " + yml_key_level2 + " " + yml_key_level3 + ": " +
-                                                            yml_key_level4 + " created.")
+                    if yml_key_level2 == "params":
+                        for yml_key_level3, value in yml_value_level2.items():
+                            option_inst = Option(name=yml_key_level3, value=value)
+                            rule_parts.params.append(option_inst)
+                    elif yml_key_level2 in _INPUT_OR_OUTPUT:
+                        # if it is a dict, then inputs or outputs are coming
+                        if yml_key_level2 == "input":
+                            list_files, list_tables = rule_parts.input_files, rule_parts.input_tables
+                        else:
+                            list_files, list_tables = rule_parts.output_files, rule_parts.output_tables
+                        for yml_key_level3, yml_value_level3 in yml_value_level2.items():
+                            # file or table
+                            for yml_key_level4, yml_value_level4 in yml_value_level3.items():
+                                if yml_key_level3 == "file":
+                                    list_files.append(FileInputOutputInformation(file_key=yml_key_level4,
+                                                                                 path=yml_value_level4))
+
+                                elif yml_key_level3 == "table":
+                                    model_py_path = yml_value_level4
+                                    table_name = model_py_path.split('.')[-1]
+                                    list_tables.append(TableInputOutputInformation(model_py_path=model_py_path,
+                                                                                   table_key=yml_key_level4,
+                                                                                   table_name=table_name))
+                                logger.debug("Object %s %s: %s created.", yml_key_level2, yml_key_level3, yml_key_level4)
                     else:
                         # if the step is not a dict, then it is supposed to be the "tool" line
-                        tool_wrapper_py_path = self.__wopfile_yml_dict[yml_key_level1][yml_key_level2]
-                # At this point, "tool_wrapper_inst_dic" is like this:
-                # {
-                #     'dict_params': {
-                #         'option1': Option('option1', 'valueofoption1')
-                #     },
-                #     'dict_input': {
-                #         'file' : {
-                #             'input1': FileInputOutputInformation('input1', 'path/to/input1')
-                #         }
-                #         'table': {
-                #             'table1': TableInputOutputInformation('table1', 'package.of.table1')
-                #         }
-                #     },
-                # }
-
-                # Instantiate the referred class and add it to the set of objects
-                tool_wrapper_inst = self.create_tool_wrapper_inst(rule_name_str, tool_wrapper_py_path, tool_wrapper_inst_dic,
-                                                              input_entry, output_entry)
+                        tool_wrapper_py_path = yml_value_level2
+                # At this point, "rule_parts" is like this:
+                #     params: [Option('option1', 'valueofoption1')]
+                #     input_files: [FileInputOutputInformation('input1', 'path/to/input1')]
+                #     input_tables: [TableInputOutputInformation('table1', 'package.of.table1')]
+                #     output_files: [...]
+                #     output_tables: [...]
+
+                # Instantiate the referred class and add it to the list of objects
+                tool_wrapper_inst = self.create_tool_wrapper_inst(rule_name_str, tool_wrapper_py_path, rule_parts,
+                                                              input_entry, output_entry, (time_unix_ms, time_human))
                 # Associating a tool_python_path to an execution
                 tool_wrapper_inst.relation_toolwrapper_to_execution = execution
-                tool_wrapper_set.add(tool_wrapper_inst)
-                Logger.instance().debug("Instance tool_python_path: " + tool_wrapper_py_path + " created.")
-                # commit/rollback trick to clean the session - SQLAchemy bug suspected
-                session.commit()
-                session.rollback()
+                tool_wrapper_list.append(tool_wrapper_inst)
+                logger.debug("Instance tool_python_path: %s created.", tool_wrapper_py_path)
                 # totodo LucG set_table_properties outside the rules loop to take into account all the models at once
                 # (error if one tool has a foreign key refering to a table that is not in its I/O put
             TableInputOutputInformation.set_tables_properties(TableInputOutputInformation.get_execution_tables())
@@ -471,10 +551,10 @@ class Reader:
             TableModificationTime.create_triggers()
             # This create_all will create all models that have been found in the tool_python_path
             SQLManager.instance().create_all()
-            session.add_all(tool_wrapper_set)
+            session.add_all(tool_wrapper_list)
             # save all operations done so far.
             session.commit()
-            for tool_wrapper in tool_wrapper_set:
+            for tool_wrapper in tool_wrapper_list:
                 tool_wrapper.is_content_respected()
 
         except NoResultFound as e:
@@ -482,7 +562,8 @@ class Reader:
             raise WopMarsException("Error while parsing the configuration file. The database has not been setUp Correctly.",
                                    str(e))
 
-    def create_tool_wrapper_inst(self, rule_name, tool_python_path, dict_dict_dict_elm, input_entry, output_entry):
+    def create_tool_wrapper_inst(self, rule_name, tool_python_path, rule_parts, input_entry, output_entry,
+                                 current_time=None):
         """
         Actual creating of the Toolwrapper object.
 
@@ -495,21 +576,26 @@ class Reader:
         :type rule_name: str
         :param tool_python_path: Contains the is_input of the tool_python_path. It will be used for importing the correct module and then for creating the class
         :type tool_python_path: str
-        :param dict_dict_dict_elm: "input"s "output"s and "params" and will be used to make relations between options / input / output and the tool_python_path.
-        :type dict_dict_dict_elm: dict(dict(dict()))
+        :param rule_parts: "input"s "output"s and "params" and will be used to make relations between options / input / output and the tool_python_path.
+        :type rule_parts: :class:`~.wopmars.Reader.RuleParts`
         :param input_entry: input entry
         :type input_entry: :class:`wopmars.framework.bdd.models.TypeInputOrOutput.TypeInputOrOutput`
         :param output_entry: output entry
         :type output_entry: :class:`wopmars.framework.bdd.models.TypeInputOrOutput.TypeInputOrOutput`
+        :param current_time: The (epoch millis, datetime) couple used for the new modification times. Default: now.
+        :type current_time: tuple
 
         :return: TooLWrapper instance
         """
         session = SQLManager.instance().get_session()
         # Importing the module in the mod variable
         try:
-            mod = importlib.import_module(tool_python_path)
+            mod = self.__dict_tool_wrapper_modules.get(tool_python_path)
+            if mod is None:
+                mod = importlib.import_module(tool_python_path)
+                self.__dict_tool_wrapper_modules[tool_python_path] = mod
             # Building the class object
-            ToolWrapper_class = eval("mod." + tool_python_path.split('.')[-1])
+            ToolWrapper_class = getattr(mod, tool_python_path.rsplit('.', 1)[-1])
         except AttributeError:
             raise WopMarsException("Error while parsing the configuration file: \n\t",
                                    "The class " + tool_python_path + " doesn't exist.")
@@ -523,85 +609,81 @@ class Reader:
         # Initialize the instance of the user ToolWrapper
         tool_wrapper_inst = ToolWrapper_class(rule_name=rule_name)
 
+        # this is a preventing commit because the table entries below will query the database and the session has to
+        # be clean. I think it is a bug in SQLAlchemy which not allows queries then insert statements in the same
+        # session. Done once here rather than before each table.
+        session.commit()
+
+        # insert in the database the mtime_epoch_millis of last modification of the developper-side tables which are
+        # not known yet: the known ones are retrieved with a single query instead of one query per table
+        table_name_set = set(tableioinfo.model_py_path.split('.')[-1]
+                             for list_tables in (rule_parts.input_tables, rule_parts.output_tables)
+                             for tableioinfo in list_tables)
+        dict_table_name_to_modification_table_entry = {}
+        if table_name_set:
+            for modification_table_entry in session.query(TableModificationTime)\
+                    .filter(TableModificationTime.table_name.in_(table_name_set)).all():
+                dict_table_name_to_modification_table_entry[modification_table_entry.table_name] = modification_table_entry
+            time_unix_ms, time_human = current_time or get_current_time()
+            for table_name in table_name_set - set(dict_table_name_to_modification_table_entry):
+                modification_table_entry = TableModificationTime(table_name=table_name,
+                                                                 mtime_epoch_millis=time_unix_ms,
+                                                                 mtime_human=time_human)
+                session.add(modification_table_entry)
+                dict_table_name_to_modification_table_entry[table_name] = modification_table_entry
+
         # associating ToolWrapper instances with their files / models
-        for elm in dict_dict_dict_elm["dict_input"]:
-            if elm == "file":
-                for input_f in dict_dict_dict_elm["dict_input"][elm]:
-                    # set the type of FileInputOutputInformation object
-                    iofileput_entry = dict_dict_dict_elm["dict_input"][elm][input_f]
-                    iofileput_entry.relation_file_or_tableioinfo_to_typeio = input_entry
-                    try:
-                        # associating file and tool_python_path
-                        tool_wrapper_inst.relation_toolwrapper_to_fileioinfo.append(iofileput_entry)
-                    except ObjectDeletedError as e:
-                        raise WopMarsException("Error in the tool_python_path class declaration. Please, notice the developer",
-                                               "The error is probably caused by the lack of the 'polymorphic_identity' attribute"
-                                               " in the tool_python_path. Error message: \n" + str(e))
-            elif elm == "table":
-                for input_t in dict_dict_dict_elm["dict_input"][elm]:
-                    # input_t is the is_input of the table (not the model)
-                    # this is a preventing commit because next statement will create a new table and the session has to
-                    # be clean. I think it is a bug in SQLAlchemy which not allows queries then insert statements in
-                    # the same session
-                    session.commit()
-                    iodbput_entry = dict_dict_dict_elm["dict_input"][elm][input_t]
-                    # the user-side models are created during the reading of the definition file
-                    # table_entry = TableInputOutputInformation(is_input=dict_dict_dict_elm["dict_input"][elm][input_t], tablename=input_t)
-                    # insert in the database the mtime_epoch_millis of last modification of a developper-side table
-                    time_unix_ms, time_human = get_current_time()
-                    model_py_path_suffix = dict_dict_dict_elm["dict_input"][elm][input_t].model_py_path.split('.')[-1]
-                    modification_table_entry, created = session.get_or_create(TableModificationTime,
-                                                                              defaults={
-                                                                                  "mtime_epoch_millis": time_unix_ms,
-                                                                                  "mtime_human": time_human},
-                                                                              table_name=model_py_path_suffix)
-                    iodbput_entry.relation_tableioinfo_to_tablemodiftime = modification_table_entry
-                    iodbput_entry.relation_file_or_tableioinfo_to_typeio = input_entry
-                    try:
-                        tool_wrapper_inst.relation_toolwrapper_to_tableioinfo.append(iodbput_entry)
-                    except ObjectDeletedError as e:
-                        raise WopMarsException("Error in the tool_python_path class declaration. Please, notice the developer",
-                                               "The error is probably caused by the lack of the 'polymorphic_identity' attribute"
-                                               " in the tool_python_path. Error message: \n" + str(e))
-
-        for elm in dict_dict_dict_elm["dict_output"]:
-            if elm == "file":
-                for output_f in dict_dict_dict_elm["dict_output"][elm]:
-                    iofileput_entry = dict_dict_dict_elm["dict_output"][elm][output_f]
-                    iofileput_entry.relation_file_or_tableioinfo_to_typeio = output_entry
-                    try:
-                        tool_wrapper_inst.relation_toolwrapper_to_fileioinfo.append(iofileput_entry)
-                    except ObjectDeletedError as e:
-                        raise WopMarsException("Error in the tool_python_path class declaration. Please, notice the developer",
-                                               "The error is probably caused by the lack of the 'polymorphic_identity' attribute"
-                                               " in the tool_python_path. Error message: \n" + str(e))
-            elif elm == "table":
-                for output_t in dict_dict_dict_elm["dict_output"][elm]:
-                    # output_t is the table is_input (not the model)
-                    session.commit()
-                    iodbput_entry = dict_dict_dict_elm["dict_output"][elm][output_t]
-                    time_unix_ms, time_human = get_current_time()
-                    # This corresponds the __tablename__ of the database in the database
-                    model_py_path_suffix = dict_dict_dict_elm["dict_output"][elm][output_t].model_py_path.split('.')[-1]
-                    modification_table_entry, created = session.get_or_create(TableModificationTime,
-                                                                              defaults={
-                                                                                  "mtime_epoch_millis": time_unix_ms,
-                                                                                  "mtime_human": time_human},
-                                                                              table_name=model_py_path_suffix)
-                    iodbput_entry.relation_tableioinfo_to_tablemodiftime = modification_table_entry
-                    iodbput_entry.relation_file_or_tableioinfo_to_typeio = output_entry
-                    try:
-                        tool_wrapper_inst.relation_toolwrapper_to_tableioinfo.append(iodbput_entry)
-                    except ObjectDeletedError as e:
-                        raise WopMarsException(
-                            "Error in the tool_python_path class declaration. Please, notice the developer",
-                            "The error is probably caused by the lack of the 'polymorphic_identity' attribute"
-                            " in the tool_python_path. Error message: \n" + str(
-                                e))
-
-        for opt in dict_dict_dict_elm["dict_params"]:
+        for iofileput_entry in rule_parts.input_files:
+            # set the type of FileInputOutputInformation object
+            iofileput_entry.relation_file_or_tableioinfo_to_typeio = input_entry
+            try:
+                # associating file and tool_python_path
+                tool_wrapper_inst.relation_toolwrapper_to_fileioinfo.append(iofileput_entry)
+            except ObjectDeletedError as e:
+                raise WopMarsException("Error in the tool_python_path class declaration. Please, notice the developer",
+                                       "The error is probably caused by the lack of the 'polymorphic_identity' attribute"
+                                       " in the tool_python_path. Error message: \n" + str(e))
+        for iodbput_entry in rule_parts.input_tables:
+            # the user-side models are created during the reading of the definition file
+            model_py_path_suffix = iodbput_entry.model_py_path.split('.')[-1]
+            iodbput_entry.relation_tableioinfo_to_tablemodiftime = \
+                dict_table_name_to_modification_table_entry[model_py_path_suffix]
+            iodbput_entry.relation_file_or_tableioinfo_to_typeio = input_entry
+            try:
+                tool_wrapper_inst.relation_toolwrapper_to_tableioinfo.append(iodbput_entry)
+            except ObjectDeletedError as e:
+                raise WopMarsException("Error in the tool_python_path class declaration. Please, notice the developer",
+                                       "The error is probably caused by the lack of the 'polymorphic_identity' attribute"
+                                       " in the tool_python_path. Error message: \n" + str(e))
+
+        for iofileput_entry in rule_parts.output_files:
+            iofileput_entry.relation_file_or_tableioinfo_to_typeio = output_entry
+            try:
+                tool_wrapper_inst.relation_toolwrapper_to_fileioinfo.append(iofileput_entry)
+            except ObjectDeletedError as e:
+                raise WopMarsException("Error in the tool_python_path class declaration. Please, notice the developer",
+                                       "The error is probably caused by the lack of the 'polymorphic_identity' attribute"
+                                       " in the tool_python_path. Error message: \n" + str(e))
+        for iodbput_entry in rule_parts.output_tables:
+            # This corresponds the __tablename__ of the database in the database
+            model_py_path_suffix = iodbput_entry.model_py_path.split('.')[-1]
+            iodbput_entry.relation_tableioinfo_to_tablemodiftime = \
+                dict_table_name_to_modification_table_entry[model_py_path_suffix]
+            iodbput_entry.relation_file_or_tableioinfo_to_typeio = output_entry
+            try:
+                tool_wrapper_inst.relation_toolwrapper_to_tableioinfo.append(iodbput_entry)
+            except ObjectDeletedError as e:
+                raise WopMarsException("Error in the tool_python_path class declaration. Please, notice the developer",
+                                       "The error is probably caused by the lack of the 'polymorphic_identity' attribute"
+                                       " in the tool_python_path. Error message: \n" + str(e))
+
+        for option_entry in rule_parts.params:
             # associating option and tool_python_path
-            tool_wrapper_inst.relation_toolwrapper_to_option.append(dict_dict_dict_elm["dict_params"][opt])
+            tool_wrapper_inst.relation_toolwrapper_to_option.append(option_entry)
 
         # toolwrapper_wrapper.is_content_respected()
         return tool_wrapper_inst
+
+
+# Allows to raise an exception if duplicate keys are found on the same document hirearchy level.
+WopfileLoader.add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, Reader.no_duplicates_constructor)
@@ -123,8 +123,8 @@ class ToolWrapperThread(threading.Thread, Observable):
 
         :return: The string containg the command line
         """
-        list_str_inputs_files = [f.file_key + "': '" + f.path for f in self.__tool_wrapper.relation_toolwrapper_to_fileioinfo if f.relation_file_or_tableioinfo_to_typeio.is_input == 1]
-        list_str_inputs_tables = [t.table_key + "': '" + t.model_py_path for t in self.__tool_wrapper.relation_toolwrapper_to_tableioinfo if t.relation_file_or_tableioinfo_to_typeio.is_input == 1]
+        list_str_inputs_files = [f.file_key + "': '" + f.path for f in self.__tool_wrapper.get_files(is_input=True)]
+        list_str_inputs_tables = [t.table_key + "': '" + t.model_py_path for t in self.__tool_wrapper.get_tables(is_input=True)]
         str_input_dict = ""
         str_input_dict_files = ""
         str_input_dict_tables = ""
@@ -136,8 +136,8 @@ class ToolWrapperThread(threading.Thread, Observable):
         if list_str_inputs_files or list_str_inputs_tables:
             str_input_dict = " -i \"{%s}\"" % (", ".join([s for s in [str_input_dict_files, str_input_dict_tables] if s != ""]))
 
-        list_str_outputs_files = [f.file_key + "': '" + f.path for f in self.__tool_wrapper.relation_toolwrapper_to_fileioinfo if f.relation_file_or_tableioinfo_to_typeio.is_input == 0]
-        list_str_outputs_tables = [t.table_key + "': '" + t.model_py_path for t in self.__tool_wrapper.relation_toolwrapper_to_tableioinfo if t.relation_file_or_tableioinfo_to_typeio.is_input == 0]
+        list_str_outputs_files = [f.file_key + "': '" + f.path for f in self.__tool_wrapper.get_files(is_input=False)]
+        list_str_outputs_tables = [t.table_key + "': '" + t.model_py_path for t in self.__tool_wrapper.get_tables(is_input=False)]
         str_output_dict = ""
         str_output_dict_files = ""
         str_output_dict_tables = ""
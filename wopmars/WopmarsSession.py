@@ -1,6 +1,9 @@
 """
 Module containing the WopmarsSession class.
 """
+import logging
+
+from sqlalchemy import inspect
 from sqlalchemy.sql.elements import ClauseElement
 
 from wopmars.WopmarsQuery import WopmarsQuery
@@ -14,6 +17,8 @@ class WopmarsSession:
     This class is a pivot between the Toolwrapper Developer and the SQLManager. Every call to the database has to pass
     through the SQLManager but the developer has only access to the session.
     """
+    # the primary key attribute names of the models used with get_or_create
+    __dict_model_to_pk_attribute_names = {}
 
     def __init__(self, session, manager):
         """
@@ -27,12 +32,16 @@ class WopmarsSession:
         """
         Validate changes on the database. Should be used when everything is ok.
         """
-        if self.something():
-            Logger.instance().debug(str(self.__session) + " is about to commit.")
-            Logger.instance().debug("Operations to be commited in session" + str(self.__session) + ": \n\tUpdates:\n\t\t" +
-                                    "\n\t\t".join([str(k) for k in self.__session.dirty]) +
-                                    "\n\tInserts:\n\t\t" +
-                                    "\n\t\t".join([str(k) for k in self.__session.new]))
+        # same test as self.something(), the collections of the session are read once
+        new, dirty = self.__session.new, self.__session.dirty
+        if new or dirty or self.__session.deleted:
+            # the string of the ORM objects may need attribute loading: it is only done if there is a debug output
+            if Logger.instance().is_enabled_for(logging.DEBUG):
+                Logger.instance().debug("%s is about to commit.", self.__session)
+                Logger.instance().debug("Operations to be commited in session" + str(self.__session) + ": \n\tUpdates:\n\t\t" +
+                                        "\n\t\t".join(str(k) for k in dirty) +
+                                        "\n\tInserts:\n\t\t" +
+                                        "\n\t\t".join(str(k) for k in new))
             # call on SQLManager commit method to use the lock
             self.__manager.commit(self.__session)
 
@@ -41,10 +50,11 @@ class WopmarsSession:
         Rollback changes on the database. Should be used in case of error.
         :return:
         """
-        Logger.instance().debug("Operations to be rollbacked in session" + str(self.__session) + ": \n\tUpdates:\n\t\t" +
-                                "\n\t\t".join([str(k) for k in self.__session.dirty]) +
-                                "\n\tInserts:\n\t\t" +
-                                "\n\t\t".join([str(k) for k in self.__session.new]))
+        if Logger.instance().is_enabled_for(logging.DEBUG):
+            Logger.instance().debug("Operations to be rollbacked in session" + str(self.__session) + ": \n\tUpdates:\n\t\t" +
+                                    "\n\t\t".join(str(k) for k in self.__session.dirty) +
+                                    "\n\tInserts:\n\t\t" +
+                                    "\n\t\t".join(str(k) for k in self.__session.new))
         # call on SQLManager commit method to use the lock
         self.__manager.rollback(self.__session)
 
@@ -87,9 +97,10 @@ class WopmarsSession:
 
         :param table: A mapper object representing the table in which the content should be deleted.
         """
-        Logger.instance().debug("Deleting content of table " + table.__tablename__ + "...")
+        tablename = table.__tablename__
+        Logger.instance().debug("Deleting content of table %s...", tablename)
         self.__manager.execute(self.__session, table.__table__.delete())
-        Logger.instance().debug("Content of table " + table.__tablename__ + " deleted.")
+        Logger.instance().debug("Content of table %s deleted.", tablename)
 
     def execute(self, statement, *args, **kwargs):
         """
@@ -123,7 +134,8 @@ class WopmarsSession:
 
         :return: Bool saying if there is something in the session.
         """
-        return bool(self.__session.new) or bool(self.__session.dirty) or bool(self.__session.deleted)
+        session = self.__session
+        return bool(session.new or session.dirty or session.deleted)
 
     def get_or_create(self, model, defaults=None, **kwargs):
         """
@@ -136,7 +148,12 @@ class WopmarsSession:
 
         :return: tuple: (instance of the created entry, boolean)
         """
-        instance = self.__session.query(model).filter_by(**kwargs).first()
+        pk_attribute_names = WopmarsSession.__get_pk_attribute_names(model)
+        if set(kwargs) == set(pk_attribute_names):
+            # the entry is looked for by primary key: the identity map of the session is used before querying
+            instance = self.__session.get(model, tuple(kwargs[name] for name in pk_attribute_names))
+        else:
+            instance = self.__session.query(model).filter_by(**kwargs).first()
         if instance:
             return instance, False
         else:
@@ -146,6 +163,22 @@ class WopmarsSession:
             self.__session.add(instance)
             return instance, True
 
+    @staticmethod
+    def __get_pk_attribute_names(model):
+        """
+        Return the names of the attributes mapped to the primary key columns of a model. They are computed once per model.
+
+        :param model: A SQLAlchemy model
+        :return: tuple of str
+        """
+        try:
+            return WopmarsSession.__dict_model_to_pk_attribute_names[model]
+        except KeyError:
+            mapper = inspect(model)
+            pk_attribute_names = tuple(mapper.get_property_by_column(column).key for column in mapper.primary_key)
+            WopmarsSession.__dict_model_to_pk_attribute_names[model] = pk_attribute_names
+            return pk_attribute_names
+
     # def pandas_to_sql(self, df, tablename, *args, **kwargs):
     #     """
     #     Interface for using the to_sql method from pandas dataframes.
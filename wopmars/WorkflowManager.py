@@ -1,5 +1,7 @@
 import sys
 
+from sqlalchemy.orm import selectinload
+
 from wopmars.SQLManager import SQLManager
 from wopmars.models.Execution import Execution
 from wopmars.models.TableInputOutputInformation import TableInputOutputInformation
@@ -253,10 +255,9 @@ class WorkflowManager(ToolWrapperObserver):
                 if not OptionManager.instance()["--forceall"] and not OptionManager.instance()["--touch"]:  # if not in forceall option
                     if self.is_this_tool_wrapper_already_executed(tool_wrapper):  # this tool wrapper already executed
                         # some predecessors of this tool wrapper has not been executed
-                        if not bool([tool_wrapper_predecessor for tool_wrapper_predecessor
-                                     in self.__dag_to_exec.predecessors(tool_wrapper)
-                                     if tool_wrapper_predecessor.status != "EXECUTED"
-                                        and tool_wrapper_predecessor.status != "ALREADY_EXECUTED"]):
+                        if not any(tool_wrapper_predecessor.status != "EXECUTED"
+                                   and tool_wrapper_predecessor.status != "ALREADY_EXECUTED"
+                                   for tool_wrapper_predecessor in self.__dag_to_exec.predecessors(tool_wrapper)):
                             Logger.instance().info("ToolWrapper: {} -> {} seems to have already been run with same parameters."
                                                    .format(tool_wrapper.rule_name, tool_wrapper.tool_python_path))
                             dry = True
@@ -431,7 +432,12 @@ class WorkflowManager(ToolWrapperObserver):
         is_already_executed = tool_wrapper.output_file_exists() and tool_wrapper.output_table_exists() \
                            and tool_wrapper.is_output_more_recent_than_input()
 
-        tool_wrapper_old = session.query(ToolWrapper).filter(ToolWrapper.tool_python_path == tool_wrapper.tool_python_path)\
+        # the relations compared by ToolWrapper.__eq__ are loaded with the tool_wrapper
+        tool_wrapper_old = session.query(ToolWrapper)\
+            .options(selectinload(ToolWrapper.relation_toolwrapper_to_fileioinfo),
+                     selectinload(ToolWrapper.relation_toolwrapper_to_tableioinfo),
+                     selectinload(ToolWrapper.relation_toolwrapper_to_option))\
+            .filter(ToolWrapper.tool_python_path == tool_wrapper.tool_python_path)\
             .filter(ToolWrapper.execution_id != tool_wrapper.execution_id)\
             .order_by(ToolWrapper.id.desc()).first()
 
@@ -18,7 +18,7 @@ class FileInputOutputInformation(InputOutput, Base):
     - is_input: VARCHAR(255) - the is_input of the reference to the file
     - path: VARCHAR(255) - the path to the file
     - toolwrapper_id: INTEGER - foreign key to the associated rule ID: :class:`wopmars.framework.database.tables.ToolWrapper.ToolWrapper`
-    - is_input: INTEGER - foreign key to the associated type ID: :class:`wopmars.framework.database.tables.TypeInputOrOutput.TypeInputOrOutput`
+    - is_input: BOOLEAN - foreign key to the associated type: :class:`wopmars.models.TypeInputOrOutput.TypeInputOrOutput`. Read directly to know if the file is an input
     - mtime_epoch_millis: INTEGER - unix mtime_epoch_millis at which the table have been used
     - size: INTEGER - the size of the file
     """
@@ -16,13 +16,16 @@ class Option(Base):
     - toolwrapper_id: INTEGER - the ID of the associated rule
     """
 
-    # static value necessary to perform tests on Options
-    static_option_castable = (
-        "bool",
-        "str",
-        "int",
-        "float"
-       )
+    # static value necessary to perform tests on Options: the builtin type used to cast a value for each castable type,
+    # instead of evaluating the name of the type. The membership tests of the castable types are done on this dict
+    static_option_cast = {
+        "bool": bool,
+        "str": str,
+        "int": int,
+        "float": float
+    }
+    # the castable types, in the order of the error messages, derived from the dict so that they can not drift apart
+    static_option_castable = tuple(static_option_cast)
     static_option_req = "required"
     static_option_default = "optional"
 
@@ -51,10 +54,10 @@ class Option(Base):
         for s_type in list_splitted_carac:
             s_formated_type = s_type.strip().lower()
             # check if the carac is a autorized castable type
-            if s_formated_type in Option.static_option_castable:
+            if s_formated_type in Option.static_option_cast:
                 try:
                     # try the cast
-                    eval(s_formated_type)(self.value)
+                    Option.static_option_cast[s_formated_type](self.value)
                 except ValueError:
                     # if it fails, raise an exception: the type has not been respected
                     raise WopMarsException("The content of the definition file is not valid.",
@@ -23,7 +23,7 @@ class TableInputOutputInformation(InputOutput, Base):
     - tablename: VARCHAR(255) - foreign key to the associated table: :class:`wopmars.framework.database.relation_toolwrapper_to_tableioinfo.TableModificationTime.TableModificationTime` - the is_input of the referenced table
     - model: VARCHAR(255) - the path to the model (in python notation)
     - toolwrapper_id: INTEGER - foreign key to the associated rule ID: :class:`wopmars.framework.database.relation_toolwrapper_to_tableioinfo.ToolWrapper.ToolWrapper`
-    - is_input: INTEGER - foreign key to the associated type ID: :class:`wopmars.framework.database.relation_toolwrapper_to_tableioinfo.TypeInputOrOutput.TypeInputOrOutput`
+    - is_input: BOOLEAN - foreign key to the associated type: :class:`wopmars.models.TypeInputOrOutput.TypeInputOrOutput`. Read directly to know if the table is an input
     - mtime_epoch_millis: INTEGER - unix mtime_epoch_millis at which the table have been used
     """
 
@@ -1,7 +1,7 @@
 import os
 import pathlib
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, event
 from sqlalchemy.orm import relationship
 
 from wopmars.Base import Base
@@ -10,7 +10,7 @@ from wopmars.models.Option import Option
 from wopmars.utils.Logger import Logger
 from wopmars.utils.OptionManager import OptionManager
 from wopmars.utils.WopMarsException import WopMarsException
-from wopmars.utils.various import get_mtime, get_current_time
+from wopmars.utils.various import get_mtime, get_mtime_and_size, get_current_time
 from wopmars.models.TableModificationTime import TableModificationTime
 
 
@@ -65,6 +65,18 @@ class ToolWrapper(Base):
     READY = 2
     NOT_READY = 3
 
+    # the files and tables partitioned by type, see get_files and get_tables. Computed on first access and reset by the
+    # listeners at the bottom of the module each time the relations change.
+    __dict_is_input_to_files_and_tables = None
+    # the paths of the files and the models of the tables by type, used by follows. Reset with the partition.
+    __dict_is_input_to_paths_and_models = None
+    # the files and tables by type and by key, used by the accessors input_file, output_table, etc. Reset with the partition.
+    __dict_is_input_to_files_and_tables_by_key = None
+    # the values of the options by name, used by option. Reset with the partition.
+    __dict_option_name_to_value = None
+    # the cast function of each param of specify_params, or None if it has no castable type, used by option.
+    __dict_param_to_cast = None
+
     def __init__(self, rule_name=""):
         """
         The constructor of the tool_python_path, must not be overwritten.
@@ -117,11 +129,9 @@ class ToolWrapper(Base):
         :raise WopMarsException: The input are not respected by the user.
         """
 
-        fileioinfo_name_set = set([fileioinfo.file_key for fileioinfo in self.relation_toolwrapper_to_fileioinfo
-                                    if fileioinfo.relation_file_or_tableioinfo_to_typeio.is_input == is_input])
+        fileioinfo_name_set = {fileioinfo.file_key for fileioinfo in self.get_files(is_input)}
 
-        tableio_tablename_set = set([tableioinfo.table_key for tableioinfo in self.relation_toolwrapper_to_tableioinfo
-                                     if tableioinfo.relation_file_or_tableioinfo_to_typeio.is_input == is_input])
+        tableio_tablename_set = {tableioinfo.table_key for tableioinfo in self.get_tables(is_input)}
 
         # tableio_tablename_set = set([tableioinfo.model_py_path.split('.')[-1] for tableioinfo in self.relation_toolwrapper_to_tableioinfo
         #                              if tableioinfo.relation_file_or_tableioinfo_to_typeio.is_input == is_input])
@@ -219,15 +229,17 @@ class ToolWrapper(Base):
         :raises WopMarsException: If the params names and types are not respected by the user.
         """
         dict_wrapper_opt_carac = self.specify_params()
+        option_names = [opt.name for opt in self.relation_toolwrapper_to_option]
+        option_name_set = set(option_names)
 
         # check if the given relation_toolwrapper_to_option are authorized
-        if not set([opt.name for opt in self.relation_toolwrapper_to_option]).issubset(dict_wrapper_opt_carac):
+        if not option_name_set.issubset(dict_wrapper_opt_carac):
             raise WopMarsException("The content of the definition file is not valid.",
                                    "The given option variable for the rule " + str(self.rule_name) + " -> " + self.__class__.__name__ +
                                    " are not correct, they should be in: " +
                                    "\n\t'{0}'".format("'\n\t'".join(dict_wrapper_opt_carac)) +
                                    "\n" + "They are:" +
-                                   "\n\t'{0}'".format("'\n\t'".join([opt.name for opt in self.relation_toolwrapper_to_option]))
+                                   "\n\t'{0}'".format("'\n\t'".join(option_names))
                                    )
 
         # check if the types correspond
@@ -235,8 +247,9 @@ class ToolWrapper(Base):
             opt.correspond(dict_wrapper_opt_carac[opt.name])
 
         # check if the required relation_toolwrapper_to_option are given
-        for opt in dict_wrapper_opt_carac:
-            if "required" in str(dict_wrapper_opt_carac[opt]).lower() and opt not in [opt2.name for opt2 in self.relation_toolwrapper_to_option]:
+        for opt, carac in dict_wrapper_opt_carac.items():
+            if opt not in option_name_set and \
+                    Option.static_option_req in {s_carac.strip().lower() for s_carac in str(carac).split("|")}:
                 raise WopMarsException("The content of the definition file is not valid.",
                                        "The option '" + opt + "' has not been provided but it is required.")
 
@@ -254,17 +267,121 @@ class ToolWrapper(Base):
         :param other: ToolWrapper that is possibly a predecessor of "self"
         :return: bool True if "self" follows "other"
         """
-        for rule_f_path in [f.path for f in self.relation_toolwrapper_to_fileioinfo if f.relation_file_or_tableioinfo_to_typeio.is_input == 1]:
-            for rule_f2_path in [f.path for f in other.relation_toolwrapper_to_fileioinfo if f.relation_file_or_tableioinfo_to_typeio.is_input == 0]:
-                if rule_f_path == rule_f2_path:
-                    return True
+        input_paths, input_models = self.__get_paths_and_models(is_input=True)
+        output_paths, output_models = other.__get_paths_and_models(is_input=False)
+        return not (input_paths.isdisjoint(output_paths) and input_models.isdisjoint(output_models))
+
+    def get_files(self, is_input):
+        """
+        Return the files of the ToolWrapper for a given type (input or output).
+
+        :param is_input: True for the input files, False for the output files
+        :type is_input: bool
+        :return: tuple of :class:`~.wopmars.models.FileInputOutputInformation.FileInputOutputInformation`
+        """
+        return self.__get_files_and_tables()[bool(is_input)][0]
+
+    def get_tables(self, is_input):
+        """
+        Return the tables of the ToolWrapper for a given type (input or output).
+
+        :param is_input: True for the input tables, False for the output tables
+        :type is_input: bool
+        :return: tuple of :class:`~.wopmars.models.TableInputOutputInformation.TableInputOutputInformation`
+        """
+        return self.__get_files_and_tables()[bool(is_input)][1]
+
+    def __get_files_and_tables(self):
+        """
+        Partition the files and tables of the ToolWrapper by type, in one pass over each relation.
+
+        The partition is kept until :meth:`~.wopmars.models.ToolWrapper.ToolWrapper.invalidate_partitions` is called.
+
+        :return: {bool: ((FileInputOutputInformation, ...), (TableInputOutputInformation, ...))}
+        """
+        if self.__dict_is_input_to_files_and_tables is None:
+            dict_is_input_to_files_and_tables = {True: ([], []), False: ([], [])}
+            for fileioinfo in self.relation_toolwrapper_to_fileioinfo:
+                dict_is_input_to_files_and_tables[ToolWrapper.__is_input(fileioinfo)][0].append(fileioinfo)
+            for tableioinfo in self.relation_toolwrapper_to_tableioinfo:
+                dict_is_input_to_files_and_tables[ToolWrapper.__is_input(tableioinfo)][1].append(tableioinfo)
+            # the partitions are frozen: the callers can not alter the cached lists by mistake
+            self.__dict_is_input_to_files_and_tables = {
+                is_input: (tuple(files), tuple(tables))
+                for is_input, (files, tables) in dict_is_input_to_files_and_tables.items()}
+        return self.__dict_is_input_to_files_and_tables
+
+    @staticmethod
+    def __is_input(file_or_tableioinfo):
+        """
+        Tell if a file or a table is an input.
+
+        The relation to TypeInputOrOutput is followed only when it is already in the dict of the instance, which is the
+        case when it has been assigned: the type of a file or table which is pending, or which has been retyped and not
+        flushed yet, is not given by the is_input column. Otherwise, the is_input foreign key column is read, which
+        avoids loading the relation for the files and tables loaded from the database.
+
+        :param file_or_tableioinfo: FileInputOutputInformation or TableInputOutputInformation
+        :return: bool
+        """
+        typeio = file_or_tableioinfo.__dict__.get("relation_file_or_tableioinfo_to_typeio")
+        if typeio is None:
+            is_input = file_or_tableioinfo.is_input
+            if is_input is not None:
+                return bool(is_input)
+            typeio = file_or_tableioinfo.relation_file_or_tableioinfo_to_typeio
+        return bool(typeio.is_input)
+
+    def __get_paths_and_models(self, is_input):
+        """
+        Return the paths of the files and the model_py_path of the tables of the ToolWrapper for a given type.
+
+        The sets are kept with the partition of the files and tables.
+
+        :param is_input: True for the inputs, False for the outputs
+        :type is_input: bool
+        :return: (frozenset(str), frozenset(str))
+        """
+        if self.__dict_is_input_to_paths_and_models is None:
+            self.__dict_is_input_to_paths_and_models = {
+                b: (frozenset(f.path for f in self.get_files(b)), frozenset(t.model_py_path for t in self.get_tables(b)))
+                for b in (True, False)}
+        return self.__dict_is_input_to_paths_and_models[bool(is_input)]
+
+    def __get_files_and_tables_by_key(self, is_input):
+        """
+        Return the files of the ToolWrapper by file_key and its tables by table_key for a given type.
+
+        The dicts are kept with the partition of the files and tables. If some keys are given twice, the first file or
+        table is kept, as the accessors did when they looked for the key in the relations.
+
+        :param is_input: True for the inputs, False for the outputs
+        :type is_input: bool
+        :return: ({str: FileInputOutputInformation}, {str: TableInputOutputInformation})
+        """
+        if self.__dict_is_input_to_files_and_tables_by_key is None:
+            self.__dict_is_input_to_files_and_tables_by_key = {
+                b: ({f.file_key: f for f in reversed(self.get_files(b))},
+                    {t.table_key: t for t in reversed(self.get_tables(b))})
+                for b in (True, False)}
+        return self.__dict_is_input_to_files_and_tables_by_key[bool(is_input)]
+
+    def invalidate_partitions(self):
+        """
+        Forget the files and tables partitioned by type and the options by name, they will be computed again on the next
+        access.
 
-        for rule_t_name in [t.model_py_path for t in self.relation_toolwrapper_to_tableioinfo if t.relation_file_or_tableioinfo_to_typeio.is_input == 1]:
-            for rule_t2_name in [t.model_py_path for t in other.relation_toolwrapper_to_tableioinfo if t.relation_file_or_tableioinfo_to_typeio.is_input == 0]:
-                if rule_t_name == rule_t2_name:
-                    return True
+        Called by the listeners of the relations of the ToolWrapper, it should only be called by hand if the type of a
+        file or table is changed once it is associated with the ToolWrapper.
 
-        return False
+        The caches are built without lock: each of them is filled before being assigned to the ToolWrapper, so a thread
+        sees either None and builds it again, or the complete value. The relations should not be modified anymore once
+        the ToolWrapper is run.
+        """
+        self.__dict_is_input_to_files_and_tables = None
+        self.__dict_is_input_to_paths_and_models = None
+        self.__dict_is_input_to_files_and_tables_by_key = None
+        self.__dict_option_name_to_value = None
 
     ### Workflow Manager methods
 
@@ -275,7 +392,7 @@ class ToolWrapper(Base):
         :return: bool - True if inputs are ready.
         """
         input_files_not_ready = []
-        input_files = [f for f in self.relation_toolwrapper_to_fileioinfo if f.relation_file_or_tableioinfo_to_typeio.is_input == 1]
+        input_files = self.get_files(is_input=True)
         for i in input_files:
             if not i.is_ready():
                 input_files_not_ready.append(i)
@@ -287,7 +404,7 @@ class ToolWrapper(Base):
 
         :return: bool - True if inputs are ready.
         """
-        input_files = [f for f in self.relation_toolwrapper_to_fileioinfo if f.relation_file_or_tableioinfo_to_typeio.is_input == 1]
+        input_files = self.get_files(is_input=True)
         Logger.instance().debug("Inputs files of " + str(self.__class__.__name__) + ": " + str([i.file_key for i in input_files]))
         for i in input_files:
             if not i.is_ready():
@@ -296,7 +413,7 @@ class ToolWrapper(Base):
                 return False
             Logger.instance().debug("Input: " + str(i.file_key) + " is ready.")
 
-        input_tables = [t for t in self.relation_toolwrapper_to_tableioinfo if t.relation_file_or_tableioinfo_to_typeio.is_input == 1]
+        input_tables = self.get_tables(is_input=True)
         Logger.instance().debug("Inputs tables of " + str(self.__class__.__name__) + ": " + str([i.table_key for i in input_tables]))
         for i in input_tables:
             if not i.is_ready():
@@ -326,20 +443,18 @@ class ToolWrapper(Base):
         :is_input dry: bool
         """
         session = SQLManager.instance().get_session()
-        for f in [f for f in self.relation_toolwrapper_to_fileioinfo if f.relation_file_or_tableioinfo_to_typeio.is_input == is_input]:
+        files = self.get_files(is_input)
+        for f in files:
             try:
-                mtime_epoch_millis, mtime_human = get_mtime(f.path)
+                mtime_epoch_millis, mtime_human, size = get_mtime_and_size(f.path)
                 f.mtime_human = mtime_human
                 f.mtime_epoch_millis = mtime_epoch_millis
-                size = os.path.getsize(f.path)
-                f.size = size
-                size = os.path.getsize(f.path)
             except FileNotFoundError as FE:
                 # totodo LucG ask lionel sans ce rollback, ca bug, pourquoi? la session est vide... comme si la query etait bloquante
                 if not OptionManager.instance()["--dry-run"]:
                     session.rollback()
                     raise WopMarsException("Error during the execution of the workflow",
-                                           "The " + is_input + " file " + str(f.path) + " of rule " + str(self.rule_name) +
+                                           "The " + ("input" if is_input else "output") + " file " + str(f.path) + " of rule " + str(self.rule_name) +
                                            " doesn't exist")
                 else:
                     # in dry-run mode, input/output files might not exist
@@ -347,23 +462,20 @@ class ToolWrapper(Base):
                     size = None
             f.used_at = mtime_epoch_millis
             f.size = size
-            session.add(f)
             if is_input == 1:
                 Logger.instance().debug("Input file " + str(f) + " used.")
             elif is_input == 0 and dry:
                 Logger.instance().debug("Output file " + str(f) + " has been loaded from previous execution.")
             elif is_input == 0 and not dry:
                 Logger.instance().debug("Output file " + str(f) + " has been created.")
-        # this commit is due to a bug that i couldn't figure out: the session empty itself between the two loops...
-        # this is not good at all since it may lead to inconsistence in the database
-        session.commit()
 
-        for t in [tableioinfo for tableioinfo in self.relation_toolwrapper_to_tableioinfo
-                  if tableioinfo.relation_file_or_tableioinfo_to_typeio.is_input == is_input]:
+        tables = self.get_tables(is_input)
+        for t in tables:
             t.mtime_human = t.relation_tableioinfo_to_tablemodiftime.mtime_human
             t.mtime_epoch_millis = t.relation_tableioinfo_to_tablemodiftime.mtime_epoch_millis
             # t.used_at = t.relation_tableioinfo_to_tablemodiftime.mtime_epoch_millis
-            session.add(t)
+        # the files and the tables are written with one commit
+        session.add_all(files + tables)
         session.commit()
 
     def same_input_than(self, other):
@@ -388,9 +500,9 @@ class ToolWrapper(Base):
         #
         #############################################################
 
-        for f in [f for f in self.relation_toolwrapper_to_fileioinfo if f.relation_file_or_tableioinfo_to_typeio.is_input == 1]:
+        for f in self.get_files(is_input=True):
             is_same = False
-            for f2 in [f2 for f2 in other.relation_toolwrapper_to_fileioinfo if f2.relation_file_or_tableioinfo_to_typeio.is_input == 1]:
+            for f2 in other.get_files(is_input=True):
                 # two files are the same if they have the same is_input, path, size and modification mtime_epoch_millis
                 if (f.file_key == f2.file_key and f.path == f2.path and
                         f.mtime_epoch_millis == f2.mtime_epoch_millis and f.size == f2.size):
@@ -405,9 +517,9 @@ class ToolWrapper(Base):
         #
         #############################################################
 
-        for t in [t for t in self.relation_toolwrapper_to_tableioinfo if t.relation_file_or_tableioinfo_to_typeio.is_input == 1]:
+        for t in self.get_tables(is_input=True):
             is_same = False
-            for t2 in [t2 for t2 in other.relation_toolwrapper_to_tableioinfo if t2.relation_file_or_tableioinfo_to_typeio.is_input == 1]:
+            for t2 in other.get_tables(is_input=True):
                 # two tables are the same if they have the same model/table_key/modification mtime_epoch_millis
                 if (t.model_py_path == t2.model_py_path and t.table_key == t2.table_key and
                        t.mtime_epoch_millis == t2.mtime_epoch_millis):
@@ -425,28 +537,35 @@ class ToolWrapper(Base):
         In a conventionnal use of WoPMaRS, the output are supposed to be younger than the inputs. If they are not,
         we can consider that the input has changed since the last execution and the output has to be re-written.
 
+        A ToolWrapper without output has nothing which could be more recent: it is not considered as already executed.
+        A ToolWrapper without input has outputs more recent than its inputs.
+
         :return: Bool: True if the output is actually more recent than input
         """
-
-        newest_input_file = [get_mtime(input_fileioinfo.path)[0]
-                             for input_fileioinfo in self.relation_toolwrapper_to_fileioinfo
-                                  if input_fileioinfo.relation_file_or_tableioinfo_to_typeio.is_input == 1]
-        newest_input_table = [input_tableioinfo.relation_tableioinfo_to_tablemodiftime.mtime_epoch_millis
-                                   for input_tableioinfo in self.relation_toolwrapper_to_tableioinfo
-                                   if input_tableioinfo.relation_file_or_tableioinfo_to_typeio.is_input == 1]
+        output_files = self.get_files(is_input=False)
+        output_tables = self.get_tables(is_input=False)
+        if not output_files and not output_tables:
+            return False
+
+        # the mtime of the input files has been set by set_args_time_and_size just before, the disk is only read for the
+        # files whose mtime is not known
+        input_mtimes = [input_fileioinfo.mtime_epoch_millis if input_fileioinfo.mtime_epoch_millis is not None
+                        else get_mtime(input_fileioinfo.path)[0] for input_fileioinfo in self.get_files(is_input=True)]
+        input_mtimes.extend(input_tableioinfo.relation_tableioinfo_to_tablemodiftime.mtime_epoch_millis
+                            for input_tableioinfo in self.get_tables(is_input=True))
+        if not input_mtimes:
+            return True
         # newest is supposed to have largest epoch time
-        newest_input = max(newest_input_file + newest_input_table)
-
-        oldest_output_file = [get_mtime(output_fileioinfo.path)[0]
-                              for output_fileioinfo in self.relation_toolwrapper_to_fileioinfo
-                              if output_fileioinfo.relation_file_or_tableioinfo_to_typeio.is_input == 0]
-        oldest_output_table = [output_tableioinfo.relation_tableioinfo_to_tablemodiftime.mtime_epoch_millis
-                               for output_tableioinfo in self.relation_toolwrapper_to_tableioinfo
-                               if output_tableioinfo.relation_file_or_tableioinfo_to_typeio.is_input == 0]
-        # newest is supposed to have smallest epoch time
-        oldest_output = min(oldest_output_file + oldest_output_table)
+        newest_input = max(input_mtimes)
 
-        return newest_input < oldest_output
+        # the outputs are compared one by one to stop at the first one older than the newest input
+        for output_tableioinfo in output_tables:
+            if output_tableioinfo.relation_tableioinfo_to_tablemodiftime.mtime_epoch_millis <= newest_input:
+                return False
+        for output_fileioinfo in output_files:
+            if get_mtime(output_fileioinfo.path)[0] <= newest_input:
+                return False
+        return True
 
     def same_output_than(self, other):
         """
@@ -458,18 +577,18 @@ class ToolWrapper(Base):
 
         :return: bool
         """
-        for t in [t for t in self.relation_toolwrapper_to_tableioinfo if t.relation_file_or_tableioinfo_to_typeio.is_input == 0]:
+        for t in self.get_tables(is_input=False):
             is_same = False
-            for t2 in [t2 for t2 in other.relation_toolwrapper_to_tableioinfo if t2.relation_file_or_tableioinfo_to_typeio.is_input == 0]:
+            for t2 in other.get_tables(is_input=False):
                 if t.model_py_path == t2.model_py_path and t.table_key == t2.table_key:
                     is_same = True
                     break
             if not is_same:
                 return False
 
-        for f in [f for f in self.relation_toolwrapper_to_fileioinfo if f.relation_file_or_tableioinfo_to_typeio.is_input == 1]:
+        for f in self.get_files(is_input=True):
             is_same = False
-            for f2 in [f2 for f2 in other.relation_typeio_to_fileioinfo if f2.relation_file_or_tableioinfo_to_typeio.is_input == 1]:
+            for f2 in other.get_files(is_input=True):
                 if (f.file_key == f2.file_key and
                         f.path == f2.path):
                     is_same = True
@@ -484,8 +603,7 @@ class ToolWrapper(Base):
 
         :return: Bool: True if outputs exist.
         """
-        for output_file in [this_file for this_file in self.relation_toolwrapper_to_fileioinfo
-                            if this_file.relation_file_or_tableioinfo_to_typeio.is_input == 0]:
+        for output_file in self.get_files(is_input=False):
             if not os.path.exists(output_file.path):
                 return False
         return True
@@ -497,9 +615,10 @@ class ToolWrapper(Base):
         :return: Bool: True if outputs exist.
         """
 
-        for output_table in [table for table in self.relation_toolwrapper_to_tableioinfo
-                             if table.relation_file_or_tableioinfo_to_typeio.is_input == 0]:
-            if not SQLManager.instance().get_session().query(output_table.get_table()).count():
+        session = SQLManager.instance().get_session()
+        for output_table in self.get_tables(is_input=False):
+            # SELECT EXISTS stops at the first row instead of counting all of them
+            if not session.query(session.query(output_table.get_table()).exists()).scalar():
                 return False
         return True
 
@@ -552,15 +671,10 @@ class ToolWrapper(Base):
         :type is_input: str
         :return: Bool: True if the files are the same
         """
-        for f in [rf for rf in self.relation_toolwrapper_to_fileioinfo if rf.relation_file_or_tableioinfo_to_typeio.is_input == is_input]:
-            is_in = bool([rf for rf in other.relation_toolwrapper_to_fileioinfo if (
-                    os.path.abspath(f.path) == os.path.abspath(rf.path) and # same absolute path
-                    f.file_key == rf.file_key and  # same file field name
-                    rf.relation_file_or_tableioinfo_to_typeio.is_input == is_input  # files are same input
-            )])
-            if not is_in:
-                return False
-        return True
+        # the files are the same if they have the same file field name and the same absolute path. The absolute paths
+        # are computed once per file, they depend on the working directory so they are not kept between calls
+        return {(f.file_key, os.path.abspath(f.path)) for f in self.get_files(is_input)} <= \
+               {(rf.file_key, os.path.abspath(rf.path)) for rf in other.get_files(is_input)}
 
     def same_tables(self, other, is_input):
         """
@@ -572,10 +686,9 @@ class ToolWrapper(Base):
         :type is_input: str
         :return: Bool: True if the tables are the same
         """
-        for t in [t for t in self.relation_toolwrapper_to_tableioinfo if t.relation_file_or_tableioinfo_to_typeio.is_input == is_input]:
-            is_in = bool([t for t in other.relation_toolwrapper_to_tableioinfo if (t.model_py_path == t.model_py_path and
-                                                                                   t.relation_file_or_tableioinfo_to_typeio.is_input == is_input and
-                                                                                   t.table_key == t.table_key)])
+        for t in self.get_tables(is_input):
+            is_in = bool([t for t in other.get_tables(is_input) if (t.model_py_path == t.model_py_path and
+                                                                    t.table_key == t.table_key)])
             if not is_in:
                 return False
         return True
@@ -588,23 +701,14 @@ class ToolWrapper(Base):
         :type other: ToolWrapper
         :return: Bool: True if the relation_toolwrapper_to_option are the same.
         """
-        for opt in self.relation_toolwrapper_to_option:
-            is_in = bool([o for o in other.relation_toolwrapper_to_option if (o.name == opt.name and
-                                                       o.value == opt.value)])
+        # the (name, value) couples of self should all be in the ones of other
+        return {(opt.name, opt.value) for opt in self.relation_toolwrapper_to_option} <= \
+               {(o.name, o.value) for o in other.relation_toolwrapper_to_option}
 
-            if not is_in:
-                return False
-        return True
-
-    def __hash__(self):
-        """
-        Redefining the hash method allows ToolWrapper objects to be indexed in sets and dict.
-
-        Needed to use ToolWrapper as nodes of the DiGraph.
-
-        :return: int
-        """
-        return id(self)
+    # Redefining the hash method allows ToolWrapper objects to be indexed in sets and dict: defining __eq__ would
+    # otherwise set it to None. Needed to use ToolWrapper as nodes of the DiGraph. The identity hash of object is
+    # used directly, it is a C slot instead of a python method calling id(self).
+    __hash__ = object.__hash__
 
     def __repr__(self):
         """
@@ -612,57 +716,38 @@ class ToolWrapper(Base):
 
         :return: String representing the tool_python_path
         """
-        s = "\""
-        s += "ToolWrapper " + self.rule_name
-        s += "\\n"
-        s += "tool: " + self.__class__.__name__
-        s += "\\n"
-        for input_f in [f for f in self.relation_toolwrapper_to_fileioinfo if f.relation_file_or_tableioinfo_to_typeio.is_input == 1]:
-            s += "\\n\t\t" + input_f.file_key + ": " + str(input_f.path)
-        for input_t in [t for t in self.relation_toolwrapper_to_tableioinfo if t.relation_file_or_tableioinfo_to_typeio.is_input == 1]:
-            s += "\\n\t\tinput_table: " + input_t.table_key
-        s += "\\n"
-        for output_f in [f for f in self.relation_toolwrapper_to_fileioinfo if f.relation_file_or_tableioinfo_to_typeio.is_input == 0]:
-            s += "\\n\t\t" + output_f.file_key + ": " + str(output_f.path)
-        for output_t in [t for t in self.relation_toolwrapper_to_tableioinfo if t.relation_file_or_tableioinfo_to_typeio.is_input == 0]:
-            s += "\\n\t\toutput_table: " + output_t.table_key
-        s += "\""
-        return s
+        list_s = ["\"ToolWrapper ", self.rule_name, "\\n", "tool: ", self.__class__.__name__, "\\n"]
+        list_s.extend("\\n\t\t" + input_f.file_key + ": " + str(input_f.path) for input_f in self.get_files(is_input=True))
+        list_s.extend("\\n\t\tinput_table: " + input_t.table_key for input_t in self.get_tables(is_input=True))
+        list_s.append("\\n")
+        list_s.extend("\\n\t\t" + output_f.file_key + ": " + str(output_f.path) for output_f in self.get_files(is_input=False))
+        list_s.extend("\\n\t\toutput_table: " + output_t.table_key for output_t in self.get_tables(is_input=False))
+        list_s.append("\"")
+        return "".join(list_s)
 
     def dot_label(self):
         """Label for the dot dag"""
-        inputs_list_str = [str(i).replace(":", "") for i in self.relation_toolwrapper_to_fileioinfo + self.relation_toolwrapper_to_tableioinfo if i.relation_file_or_tableioinfo_to_typeio.is_input == 1]
-        outputs_list_str = [str(o).replace(":", "") for o in self.relation_toolwrapper_to_fileioinfo + self.relation_toolwrapper_to_tableioinfo if o.relation_file_or_tableioinfo_to_typeio.is_input == 0]
+        inputs_list_str = [str(i).replace(":", "") for i in self.get_files(is_input=True) + self.get_tables(is_input=True)]
+        outputs_list_str = [str(o).replace(":", "") for o in self.get_files(is_input=False) + self.get_tables(is_input=False)]
         params_list_str = [str(p).replace(":","") for p in self.relation_toolwrapper_to_option]
-        s = ""
-        s += "ToolWrapper " + self.rule_name + "\n"
-        s += "ToolWrapper " + self.__class__.__name__ + "\n"
-        s += "Inputs\n" + "\n\t".join(inputs_list_str) + "\n"
-        s += "Outputs\n" + "\n".join(outputs_list_str) + "\n"
-        s += "Parameters\n" + "\n".join(params_list_str) + "\n"
-        return(s)
+        return "".join(["ToolWrapper ", self.rule_name, "\n",
+                        "ToolWrapper ", self.__class__.__name__, "\n",
+                        "Inputs\n", "\n\t".join(inputs_list_str), "\n",
+                        "Outputs\n", "\n".join(outputs_list_str), "\n",
+                        "Parameters\n", "\n".join(params_list_str), "\n"])
 
     def __str__(self):
-        inputs_list_str = [str(i) for i in self.relation_toolwrapper_to_fileioinfo +
-                           self.relation_toolwrapper_to_tableioinfo if i.relation_file_or_tableioinfo_to_typeio.is_input == 1]
-        outputs_list_str = [str(o) for o in self.relation_toolwrapper_to_fileioinfo +
-                            self.relation_toolwrapper_to_tableioinfo if o.relation_file_or_tableioinfo_to_typeio.is_input == 0]
+        inputs_list_str = [str(i) for i in self.get_files(is_input=True) + self.get_tables(is_input=True)]
+        outputs_list_str = [str(o) for o in self.get_files(is_input=False) + self.get_tables(is_input=False)]
         params_list_str = [str(p) for p in self.relation_toolwrapper_to_option]
-        s = ""
-        s += "ToolWrapper " + str(self.rule_name) + ":" + "\n"
-        s += "\ttool: " + str(self.tool_python_path) + "\n"
-        if len(inputs_list_str) > 0:
-            s += "\tinput:" + "\n"
-            s += "\t\t" + "\n\t\t".join(inputs_list_str)
-            s += "\n"
-        if len(outputs_list_str) > 0:
-            s += "\toutput:" + "\n"
-            s += "\t\t" + "\n\t\t".join(outputs_list_str)
-            s += "\n"
-        if len(params_list_str) > 0:
-            s += "\tparams:" + "\n"
-            s += "\t\t" + "\n\t\t".join(params_list_str)
-        return s
+        list_s = ["ToolWrapper ", str(self.rule_name), ":\n", "\ttool: ", str(self.tool_python_path), "\n"]
+        if inputs_list_str:
+            list_s.extend(["\tinput:\n", "\t\t", "\n\t\t".join(inputs_list_str), "\n"])
+        if outputs_list_str:
+            list_s.extend(["\toutput:\n", "\t\t", "\n\t\t".join(outputs_list_str), "\n"])
+        if params_list_str:
+            list_s.extend(["\tparams:\n", "\t\t", "\n\t\t".join(params_list_str)])
+        return "".join(list_s)
 
     def touch(self):
         """Updates modification time of output table or file"""
@@ -673,8 +758,7 @@ class ToolWrapper(Base):
         #
         ################################################################################################################
 
-        for output_table in [table for table in self.relation_toolwrapper_to_tableioinfo
-                             if table.relation_file_or_tableioinfo_to_typeio.is_input == 0]:
+        for output_table in self.get_tables(is_input=False):
             out_table_inst = SQLManager.instance().get_session().query(TableModificationTime).filter_by(table_name=output_table.table_key).first()
             timestamp_epoch_millis, timestamp_human = get_current_time()
             out_table_inst.mtime_epoch_millis = timestamp_epoch_millis
@@ -687,10 +771,10 @@ class ToolWrapper(Base):
         #
         ################################################################################################################
 
-        for output_file in [this_file for this_file in self.relation_toolwrapper_to_fileioinfo
-                            if this_file.relation_file_or_tableioinfo_to_typeio.is_input == 0]:
-            if not (OptionManager.instance()["--directory"] is None):
-                output_file_path = os.path.join(OptionManager.instance()["--directory"], output_file.path)
+        base_dir = OptionManager.instance()["--directory"]
+        for output_file in self.get_files(is_input=False):
+            if not (base_dir is None):
+                output_file_path = os.path.join(base_dir, output_file.path)
             else:
                 output_file_path = output_file.path
             if os.path.exists(output_file_path):
@@ -767,12 +851,10 @@ class ToolWrapper(Base):
         :param key: String the is_input of the variable containing the path
         :return:
         """
-        try:
-            return [f.path for f in self.relation_toolwrapper_to_fileioinfo if f.file_key == key and f.relation_file_or_tableioinfo_to_typeio.is_input == 1][0]
-        except IndexError:
-            raise WopMarsException("Error during the execution of the ToolWrapper " + str(self.tool_python_path) +
-                                   " (rule " + self.rule_name + ").",
-                                   "The input file " + str(key) + " has not been specified.")
+        fileioinfo = self.__get_files_and_tables_by_key(is_input=True)[0].get(key)
+        if fileioinfo is None:
+            raise self.__not_specified_exception("input file", key)
+        return fileioinfo.path
 
     def input_table(self, key):
         """
@@ -781,12 +863,10 @@ class ToolWrapper(Base):
         :param key: String: the is_input of the Table object.
         :return:
         """
-        try:
-            return [t for t in self.relation_toolwrapper_to_tableioinfo if t.table_key == key and t.relation_file_or_tableioinfo_to_typeio.is_input == 1][0].get_table()
-        except IndexError:
-            raise WopMarsException("Error during the execution of the ToolWrapper " + str(self.tool_python_path) +
-                                   " (rule " + self.rule_name + ").",
-                                   "The input table " + str(key) + " has not been specified.")
+        tableioinfo = self.__get_files_and_tables_by_key(is_input=True)[1].get(key)
+        if tableioinfo is None:
+            raise self.__not_specified_exception("input table", key)
+        return tableioinfo.get_table()
 
     def output_file(self, key):
         """
@@ -795,12 +875,10 @@ class ToolWrapper(Base):
         :param key: String the is_input of the variable containing the path
         :return:
         """
-        try:
-            return [f.path for f in self.relation_toolwrapper_to_fileioinfo if f.file_key == key and f.relation_file_or_tableioinfo_to_typeio.is_input == 0][0]
-        except IndexError:
-            raise WopMarsException("Error during the execution of the ToolWrapper " + str(self.tool_python_path) +
-                                   " (rule " + self.rule_name + ").",
-                                   "The output file " + str(key) + " has not been specified.")
+        fileioinfo = self.__get_files_and_tables_by_key(is_input=False)[0].get(key)
+        if fileioinfo is None:
+            raise self.__not_specified_exception("output file", key)
+        return fileioinfo.path
 
     def output_table(self, key):
         """
@@ -809,12 +887,23 @@ class ToolWrapper(Base):
         :param key: String: the is_input of the Table object.
         :return:
         """
-        try:
-            return [t for t in self.relation_toolwrapper_to_tableioinfo if t.table_key == key and t.relation_file_or_tableioinfo_to_typeio.is_input == 0][0].get_table()
-        except IndexError:
-            raise WopMarsException("Error during the execution of the ToolWrapper " + str(self.tool_python_path) +
-                                   " (rule " + self.rule_name + ").",
-                                   "The output table " + str(key) + " has not been specified.")
+        tableioinfo = self.__get_files_and_tables_by_key(is_input=False)[1].get(key)
+        if tableioinfo is None:
+            raise self.__not_specified_exception("output table", key)
+        return tableioinfo.get_table()
+
+    def __not_specified_exception(self, kind, key):
+        """
+        Build the exception raised by the accessors when the key of a file or a table has not been specified.
+
+        :param kind: The kind of the missing element, ie: "input file"
+        :type kind: str
+        :param key: The key asked by the ToolWrapper Developer
+        :return: :class:`~.wopmars.utils.WopMarsException.WopMarsException`
+        """
+        return WopMarsException("Error during the execution of the ToolWrapper " + str(self.tool_python_path) +
+                                " (rule " + str(self.rule_name) + ").",
+                                "The " + kind + " " + str(key) + " has not been specified.")
 
     def option(self, key):
         """
@@ -826,21 +915,45 @@ class ToolWrapper(Base):
         :type key: str
         :return:
         """
-        try:
-            value = [o.value for o in self.relation_toolwrapper_to_option if o.name == key][0]
-            list_splitted_carac = self.specify_params()[key].split("|")
-            for s_type in list_splitted_carac:
-                s_formated_type = s_type.strip().lower()
-                # check if the carac is a castable type
-                if s_formated_type in Option.static_option_castable:
-                    value = eval(s_formated_type)(value)
-                    break
-            return value
-        except IndexError as e:
-            # antipattern, this is bad, but I deleted the warning because if the ToolWrapper Developer put his call to
-            # option in a loop, there will be too mutch output
-            pass
+        if self.__dict_option_name_to_value is None:
+            # the first option is kept if a name is given twice
+            self.__dict_option_name_to_value = {o.name: o.value for o in reversed(self.relation_toolwrapper_to_option)}
+        # no warning if the option is not given because if the ToolWrapper Developer put his call to option in a loop,
+        # there will be too mutch output
+        if key not in self.__dict_option_name_to_value:
             return None
+        value = self.__dict_option_name_to_value[key]
+        if self.__dict_param_to_cast is None:
+            # the caracs of the params are split once, the first castable type of each param is kept
+            dict_param_to_cast = {}
+            for s_param, carac in self.specify_params().items():
+                dict_param_to_cast[s_param] = None
+                for s_type in carac.split("|"):
+                    s_formated_type = s_type.strip().lower()
+                    # check if the carac is a castable type
+                    if s_formated_type in Option.static_option_cast:
+                        dict_param_to_cast[s_param] = Option.static_option_cast[s_formated_type]
+                        break
+            # the dict is assigned once complete, like the other caches
+            self.__dict_param_to_cast = dict_param_to_cast
+        cast = self.__dict_param_to_cast[key]
+        if cast is not None:
+            value = cast(value)
+        return value
 
     def session(self):
         return self.session
+
+
+def _invalidate_partitions(target, *args):
+    target.invalidate_partitions()
+
+
+# the partition of the files and tables by type and the options by name are reset when the relations are modified or
+# reloaded from the database
+for relation in (ToolWrapper.relation_toolwrapper_to_fileioinfo, ToolWrapper.relation_toolwrapper_to_tableioinfo,
+                 ToolWrapper.relation_toolwrapper_to_option):
+    for identifier in ("append", "remove"):
+        event.listen(relation, identifier, _invalidate_partitions, propagate=True)
+for identifier in ("expire", "refresh"):
+    event.listen(ToolWrapper, identifier, _invalidate_partitions, propagate=True)
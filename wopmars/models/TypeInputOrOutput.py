@@ -6,13 +6,11 @@ from wopmars.Base import Base
 
 class TypeInputOrOutput(Base):
     """
-    This class is the model of the table ``wom_type_input_or_output``. It stores the two kind of entry named "input" and "output" which
-    are associated with an ID.
+    This class is the model of the table ``wom_type_input_or_output``. It stores the two kind of entry "input" and "output".
 
     Fields:
 
-    - id: INTEGER - primary key -arbitrary ID
-    - is_input: VARCHAR(255) - the is_input of the type ("input" or "output")
+    - is_input: BOOLEAN - primary key - True for the type "input", False for the type "output"
     """
 
     __tablename__ = "wom_{}".format(__qualname__)
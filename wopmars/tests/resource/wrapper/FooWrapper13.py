@@ -0,0 +1,21 @@
+"""
+Module containing the FooWrapper13 class
+"""
+from wopmars.models.ToolWrapper import ToolWrapper
+
+
+class FooWrapper13(ToolWrapper):
+    """
+    This class has been done for example/testing purpose.
+    Modifications may lead to failure in tests.
+    """
+    __mapper_args__ = {'polymorphic_identity': "FooWrapper13"}
+
+    def specify_input_file(self):
+        return ["input1"]
+
+    def specify_output_file(self):
+        return ["output1"]
+
+    def specify_params(self):
+        return {"param1": "bool", "param2": "required"}
@@ -1,3 +1,4 @@
+import logging
 import threading
 
 from wopmars.models.ToolWrapper import ToolWrapper
@@ -11,5 +12,6 @@ class Query(ToolWrapper):
         return ["FooBase"]
 
     def run(self):
-        Logger.instance().info(threading._active)
+        if Logger.instance().is_enabled_for(logging.INFO):
+            Logger.instance().info(threading._active)
         self.session.query(self.input_table("FooBase")).all()
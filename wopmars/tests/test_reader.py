@@ -3,6 +3,8 @@ import shutil
 import unittest
 from unittest import TestCase
 
+import yaml
+
 from wopmars.tests.resource.wrapper.FooWrapper10 import FooWrapper10
 from wopmars.tests.resource.wrapper.FooWrapper4 import FooWrapper4
 from wopmars.tests.resource.wrapper.FooWrapper5 import FooWrapper5
@@ -16,7 +18,7 @@ from wopmars.models.TableInputOutputInformation import TableInputOutputInformati
 from wopmars.models.FileInputOutputInformation import FileInputOutputInformation
 from wopmars.models.ToolWrapper import ToolWrapper
 from wopmars.models.TypeInputOrOutput import TypeInputOrOutput
-from wopmars.Reader import Reader
+from wopmars.Reader import Reader, WopfileLoader
 from wopmars.utils.OptionManager import OptionManager
 from wopmars.utils.PathManager import PathManager
 from wopmars.utils.SetUtils import SetUtils
@@ -47,6 +49,8 @@ class TestReader(TestCase):
         # The ugly (malformed file) --------------------:
 
         self.__s_example_definition_file_duplicate_rule = os.path.join(self.__testdir_path, "resource/wopfile/example_def_file_duplicate_rule.yml")
+        self.__s_example_definition_file_duplicate_key = os.path.join(self.__testdir_path, "resource/wopfile/example_def_file_duplicate_key.yml")
+        self.__s_example_definition_file_merge_key = os.path.join(self.__testdir_path, "resource/wopfile/example_def_file_merge_key.yml")
 
         self.__list_f_to_exception_init = [
             os.path.join(self.__testdir_path, s_path) for s_path in [
@@ -55,7 +59,10 @@ class TestReader(TestCase):
                 "resource/wopfile/example_def_file_wrong_grammar.yml",
                 "resource/wopfile/example_def_file_wrong_grammar2.yml",
                 "resource/wopfile/example_def_file_wrong_grammar3.yml",
-                "resource/wopfile/example_def_file_wrong_grammar4.yml"
+                "resource/wopfile/example_def_file_wrong_grammar4.yml",
+                "resource/wopfile/example_def_file_wrong_grammar5.yml",
+                "resource/wopfile/example_def_file_wrong_grammar6.yml",
+                "resource/wopfile/example_def_file_wrong_grammar7.yml"
                 ]
         ]
 
@@ -82,6 +89,11 @@ class TestReader(TestCase):
     #     with self.assertRaises(WopMarsException):
     #         self.__reader.load_wopfile_as_yml_dic("Not existing file.")
 
+    def test_load_wopfile_wrong_grammar(self):
+        for file in self.__list_f_to_exception_init:
+            with self.assertRaises(WopMarsException):
+                self.__reader.load_wopfile_as_yml_dic(file)
+
     def test_check_duplicate_rule(self):
         with open(self.__s_example_definition_file_duplicate_rule) as file_duplicate_rule:
             with self.assertRaises(WopMarsException):
@@ -93,6 +105,17 @@ class TestReader(TestCase):
             except Exception as e:
                 raise AssertionError("Should not raise an exception " + str(e))
 
+    def test_load_wopfile_duplicate_key(self):
+        with self.assertRaises(WopMarsException):
+            self.__reader.load_wopfile_as_yml_dic(self.__s_example_definition_file_duplicate_key)
+
+    def test_load_wopfile_merge_key(self):
+        # the keys overriding the entries of a merge key are not duplicates
+        self.__reader.load_wopfile_as_yml_dic(self.__s_example_definition_file_merge_key)
+        with open(self.__s_example_definition_file_merge_key) as file_merge_key:
+            dict_wopfile = yaml.load(file_merge_key, Loader=WopfileLoader)
+        self.assertEqual(dict_wopfile["rule rule2"]["params"], {"param1": 7, "param2": 6})
+
     def test_read2(self):
         try:
             self.__reader.iterate_wopfile_yml_dic_and_insert_rules_in_db(self.__example_def_file3_path)
@@ -6,8 +6,10 @@ import unittest
 from unittest import TestCase
 
 from wopmars.tests.resource.model.FooBase import FooBase
+from wopmars.tests.resource.wrapper.FooWrapper1 import FooWrapper1
 from wopmars.tests.resource.wrapper.FooWrapper2 import FooWrapper2
 from wopmars.tests.resource.wrapper.FooWrapper3 import FooWrapper3
+from wopmars.tests.resource.wrapper.FooWrapper13 import FooWrapper13
 from wopmars.SQLManager import SQLManager
 from wopmars.models.TableInputOutputInformation import TableInputOutputInformation
 from wopmars.models.FileInputOutputInformation import FileInputOutputInformation
@@ -276,6 +278,133 @@ class TestToolWrapper(TestCase):
         self.assertTrue(self.__toolwrapper_second.follows(self.__toolwrapper_first))
         self.assertFalse(self.__toolwrapper_first.follows(self.__toolwrapper_second))
 
+    def test_get_files_and_tables(self):
+        f1 = FileInputOutputInformation(file_key="input1", path="file1.txt")
+        f1.relation_file_or_tableioinfo_to_typeio = self.input_entry
+        f2 = FileInputOutputInformation(file_key="output1", path="file2.txt")
+        f2.relation_file_or_tableioinfo_to_typeio = self.output_entry
+        t1 = TableInputOutputInformation(model_py_path="FooBase", table_key="FooBase", table_name="FooBase")
+        t1.relation_file_or_tableioinfo_to_typeio = self.output_entry
+
+        toolwrapper = FooWrapper2(rule_name="rule1")
+        toolwrapper.relation_toolwrapper_to_fileioinfo.append(f1)
+        self.assertEqual(toolwrapper.get_files(is_input=True), (f1,))
+        self.assertEqual(toolwrapper.get_files(is_input=False), ())
+
+        # the partition is computed again once the relations are modified
+        toolwrapper.relation_toolwrapper_to_fileioinfo.append(f2)
+        toolwrapper.relation_toolwrapper_to_tableioinfo.append(t1)
+        self.assertEqual(toolwrapper.get_files(is_input=False), (f2,))
+        self.assertEqual(toolwrapper.get_tables(is_input=False), (t1,))
+        self.assertEqual(toolwrapper.input_file("input1"), "file1.txt")
+        self.assertEqual(toolwrapper.output_file("output1"), "file2.txt")
+        toolwrapper.relation_toolwrapper_to_fileioinfo.remove(f1)
+        self.assertEqual(toolwrapper.get_files(is_input=True), ())
+        self.assertRaises(WopMarsException, toolwrapper.input_file, "input1")
+
+    def test_get_files_and_tables_flushed(self):
+        def build_toolwrapper(input_entry, output_entry):
+            f1 = FileInputOutputInformation(file_key="input1", path="file1.txt")
+            f1.relation_file_or_tableioinfo_to_typeio = input_entry
+            f2 = FileInputOutputInformation(file_key="output1", path="file2.txt")
+            f2.relation_file_or_tableioinfo_to_typeio = output_entry
+            t1 = TableInputOutputInformation(model_py_path="FooBase", table_key="FooBase", table_name="FooBase")
+            t1.relation_file_or_tableioinfo_to_typeio = output_entry
+            mtime_epoch_millis, mtime_human = get_current_time()
+            t1.relation_tableioinfo_to_tablemodiftime = TableModificationTime(
+                table_name="FooBase", mtime_epoch_millis=mtime_epoch_millis, mtime_human=mtime_human)
+            toolwrapper = FooWrapper2(rule_name="rule1")
+            toolwrapper.relation_toolwrapper_to_fileioinfo.extend([f1, f2])
+            toolwrapper.relation_toolwrapper_to_tableioinfo.append(t1)
+            return toolwrapper
+
+        def get_keys(toolwrapper, is_input):
+            return (sorted(f.file_key for f in toolwrapper.get_files(is_input)),
+                    sorted(t.table_key for t in toolwrapper.get_tables(is_input)))
+
+        # each toolwrapper has its own types, the ones of setUp would bring their toolwrappers in the session
+        toolwrapper_pending = build_toolwrapper(TypeInputOrOutput(is_input=True), TypeInputOrOutput(is_input=False))
+        output_entry = TypeInputOrOutput(is_input=False)
+        toolwrapper_flushed = build_toolwrapper(TypeInputOrOutput(is_input=True), output_entry)
+        self.__session.add(toolwrapper_flushed)
+        self.__session.commit()
+
+        # the rows loaded again from the database give the same partition than the pending rows, without loading
+        # their types
+        for is_input in (True, False):
+            self.assertEqual(get_keys(toolwrapper_flushed, is_input), get_keys(toolwrapper_pending, is_input))
+        for f in toolwrapper_flushed.get_files(is_input=True) + toolwrapper_flushed.get_files(is_input=False):
+            self.assertNotIn("relation_file_or_tableioinfo_to_typeio", f.__dict__)
+
+        # a flushed row which is retyped is partitioned with its new type before the flush
+        with self.__session._session().no_autoflush:
+            f1 = toolwrapper_flushed.get_files(is_input=True)[0]
+            f1.relation_file_or_tableioinfo_to_typeio = output_entry
+            toolwrapper_flushed.invalidate_partitions()
+            self.assertTrue(f1.is_input)
+            self.assertEqual(get_keys(toolwrapper_flushed, is_input=True), ([], []))
+            self.assertEqual(get_keys(toolwrapper_flushed, is_input=False), (["input1", "output1"], ["FooBase"]))
+
+    def test_option(self):
+        toolwrapper = FooWrapper2(rule_name="rule1")
+        self.assertIsNone(toolwrapper.option("param1"))
+        toolwrapper.relation_toolwrapper_to_option.append(Option(name="param1", value="1"))
+        self.assertEqual(toolwrapper.option("param1"), "1")
+
+        # the value is cast with the first castable type of the param
+        toolwrapper = FooWrapper1(rule_name="rule1")
+        toolwrapper.relation_toolwrapper_to_option.append(Option(name="param1", value="1"))
+        self.assertEqual(toolwrapper.option("param1"), 1)
+        self.assertIsInstance(toolwrapper.option("param1"), int)
+        toolwrapper = FooWrapper3(rule_name="rule1")
+        toolwrapper.relation_toolwrapper_to_option.append(Option(name="param1", value="1.5"))
+        self.assertEqual(toolwrapper.option("param1"), 1.5)
+        toolwrapper = FooWrapper13(rule_name="rule1")
+        toolwrapper.relation_toolwrapper_to_option.extend([Option(name="param1", value="1"),
+                                                           Option(name="param2", value="1")])
+        self.assertIs(toolwrapper.option("param1"), True)
+        # a param without castable type is not cast
+        self.assertEqual(toolwrapper.option("param2"), "1")
+
+    def test_is_output_more_recent_than_input(self):
+        mtime_epoch_millis, mtime_human = get_current_time()
+        # the mtime of the input file is the one set by set_args_time_and_size, the file does not exist on disk
+        f1 = FileInputOutputInformation(file_key="input1", path="not_existing_file.txt",
+                                        mtime_epoch_millis=mtime_epoch_millis + 2000, mtime_human=mtime_human)
+        f1.relation_file_or_tableioinfo_to_typeio = self.input_entry
+        t1 = TableInputOutputInformation(model_py_path="FooBase", table_key="FooBase", table_name="FooBase")
+        t1.relation_file_or_tableioinfo_to_typeio = self.input_entry
+        t1.relation_tableioinfo_to_tablemodiftime = TableModificationTime(
+            table_name="FooBase", mtime_epoch_millis=mtime_epoch_millis + 1000, mtime_human=mtime_human)
+        t2 = TableInputOutputInformation(model_py_path="FooBase2", table_key="FooBase2", table_name="FooBase2")
+        t2.relation_file_or_tableioinfo_to_typeio = self.output_entry
+        modif_t2 = TableModificationTime(table_name="FooBase2", mtime_epoch_millis=mtime_epoch_millis + 3000,
+                                         mtime_human=mtime_human)
+        t2.relation_tableioinfo_to_tablemodiftime = modif_t2
+        t3 = TableInputOutputInformation(model_py_path="FooBase3", table_key="FooBase3", table_name="FooBase3")
+        t3.relation_file_or_tableioinfo_to_typeio = self.output_entry
+        t3.relation_tableioinfo_to_tablemodiftime = TableModificationTime(
+            table_name="FooBase3", mtime_epoch_millis=mtime_epoch_millis + 5000, mtime_human=mtime_human)
+
+        toolwrapper = FooWrapper2(rule_name="rule1")
+        toolwrapper.relation_toolwrapper_to_fileioinfo.append(f1)
+        toolwrapper.relation_toolwrapper_to_tableioinfo.append(t1)
+        # without output, nothing is more recent than the inputs
+        self.assertFalse(toolwrapper.is_output_more_recent_than_input())
+
+        toolwrapper.relation_toolwrapper_to_tableioinfo.extend([t2, t3])
+        self.assertTrue(toolwrapper.is_output_more_recent_than_input())
+        # the oldest output is compared to the newest input, which is the input file
+        modif_t2.mtime_epoch_millis = mtime_epoch_millis + 1500
+        self.assertFalse(toolwrapper.is_output_more_recent_than_input())
+        modif_t2.mtime_epoch_millis = mtime_epoch_millis + 2000
+        self.assertFalse(toolwrapper.is_output_more_recent_than_input())
+
+        # without input, the outputs are more recent
+        toolwrapper.relation_toolwrapper_to_fileioinfo.remove(f1)
+        toolwrapper.relation_toolwrapper_to_tableioinfo.remove(t1)
+        self.assertTrue(toolwrapper.is_output_more_recent_than_input())
+
     def test_are_inputs_ready(self):
         self.assertTrue(self.__toolwrapper_ready.are_inputs_ready())
         self.assertFalse(self.__toolwrapper_not_ready.are_inputs_ready())
@@ -1,6 +1,7 @@
 """
 This module contains the DictUtils class.
 """
+from ast import literal_eval
 
 
 class DictUtils:
@@ -45,5 +46,5 @@ class DictUtils:
     @staticmethod
     def str_to_dict(dictable_string):
         if dictable_string:
-            d = dict(eval(dictable_string))
+            d = dict(literal_eval(dictable_string))
             return d
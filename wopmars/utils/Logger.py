@@ -38,6 +38,14 @@ class Logger(SingletonMixin):
         self.__logger = logging.getLogger('wopmars')
         self.formatter_str = '%(asctime)s :: %(levelname)s :: %(name)s :: %(message)s'
         formatter = logging.Formatter(self.formatter_str)
+        # the colored formatters of the streams are built once for each level
+        self.__dict_level_to_formatter_stream = {
+            logging.DEBUG: logging.Formatter(ColorPrint.blue(self.formatter_str)),
+            logging.INFO: logging.Formatter(ColorPrint.green(self.formatter_str)),
+            logging.WARNING: logging.Formatter(ColorPrint.yellow(self.formatter_str)),
+            logging.ERROR: logging.Formatter(ColorPrint.red(self.formatter_str)),
+            logging.CRITICAL: logging.Formatter(ColorPrint.red(self.formatter_str)),
+        }
         self.__logger.setLevel(logging.DEBUG)  # set root's level
 
         verbosity = int(OptionManager.instance()["-v"])
@@ -102,32 +110,65 @@ class Logger(SingletonMixin):
                 self.__file_handler_stderr.setLevel(logging.WARNING)
                 self.__logger.addHandler(self.__file_handler_stderr)
 
-    def debug(self, msg):
-        formatter_stream = logging.Formatter(ColorPrint.blue(self.formatter_str))
+    def is_enabled_for(self, level):
+        """
+        Tell if a message of the given level would be written by at least one of the handlers.
+
+        The handlers of the ancestors of the 'wopmars' logger are looked at too as long as the loggers propagate, like the
+        logging module does when it calls the handlers: a handler of the application using wopmars, or of pytest, still
+        gets the messages whatever the verbosity.
+
+        The level of the 'wopmars' logger is always DEBUG, the verbosity is given by the level of its handlers. This allows
+        to skip the building of costly messages which would not be written anyway, ie. in the run method of a ToolWrapper:
+
+        .. code-block:: python
+
+            if Logger.instance().is_enabled_for(logging.DEBUG):
+                Logger.instance().debug("Rows: " + str(list_rows))
+
+        :param level: The logging level, ie: logging.DEBUG
+        :type level: int
+        :return: bool
+        """
+        logger = self.__logger
+        while logger is not None:
+            if any(handler.level <= level for handler in logger.handlers):
+                return True
+            if not logger.propagate:
+                break
+            logger = logger.parent
+        return False
+
+    def debug(self, msg, *args):
+        self.__log(logging.DEBUG, msg, args)
+
+    def info(self, msg, *args):
+        self.__log(logging.INFO, msg, args)
+
+    def warning(self, msg, *args):
+        self.__log(logging.WARNING, msg, args)
+
+    def error(self, msg, *args):
+        self.__log(logging.ERROR, msg, args)
+
+    def critical(self, msg, *args):
+        self.__log(logging.CRITICAL, msg, args)
+
+    def __log(self, level, msg, args):
+        """
+        Write the message with the colored formatter of its level on the streams, if it is enabled for this level.
+
+        :param level: The logging level, ie: logging.DEBUG
+        :type level: int
+        :param msg: The message, formatted with args by the logging module
+        :type msg: str
+        :param args: The arguments of the message
+        :type args: tuple
+        """
+        # nothing is done for the messages that no handler would write
+        if not self.is_enabled_for(level):
+            return
+        formatter_stream = self.__dict_level_to_formatter_stream[level]
         self.stream_handler_stderr.setFormatter(formatter_stream)
         self.stream_handler_stdout.setFormatter(formatter_stream)
-        self.__logger.debug(msg)
-
-    def info(self, msg):
-        formatter_stream = logging.Formatter(ColorPrint.green(self.formatter_str))
-        self.stream_handler_stderr.setFormatter(formatter_stream)
-        self.stream_handler_stdout.setFormatter(formatter_stream)
-        self.__logger.info(msg)
-
-    def warning(self, msg):
-        formatter_stream = logging.Formatter(ColorPrint.yellow(self.formatter_str))
-        self.stream_handler_stderr.setFormatter(formatter_stream)
-        self.stream_handler_stdout.setFormatter(formatter_stream)
-        self.__logger.warning(msg)
-
-    def error(self, msg):
-        formatter_stream = logging.Formatter(ColorPrint.red(self.formatter_str))
-        self.stream_handler_stderr.setFormatter(formatter_stream)
-        self.stream_handler_stdout.setFormatter(formatter_stream)
-        self.__logger.error(msg)
-
-    def critical(self, msg):
-        formatter_stream = logging.Formatter(ColorPrint.red(self.formatter_str))
-        self.stream_handler_stderr.setFormatter(formatter_stream)
-        self.stream_handler_stdout.setFormatter(formatter_stream)
-        self.__logger.critical(msg)
+        self.__logger.log(level, msg, *args)
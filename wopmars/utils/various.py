@@ -16,3 +16,11 @@ def get_mtime(path):
     mtime_epoch_millis = mtime_epoch * 1000  # epoch mtime_epoch_millis in ms
     mtime_human = datetime.fromtimestamp(mtime_epoch)  # mtime in human readable local mtime_epoch_millis
     return mtime_epoch_millis, mtime_human
+
+
+def get_mtime_and_size(path):
+    stat_result = os.stat(path)  # one system call for both the mtime and the size
+    mtime_epoch = stat_result.st_mtime  # epoch mtime_epoch_millis in ms
+    mtime_epoch_millis = mtime_epoch * 1000  # epoch mtime_epoch_millis in ms
+    mtime_human = datetime.fromtimestamp(mtime_epoch)  # mtime in human readable local mtime_epoch_millis
+    return mtime_epoch_millis, mtime_human, stat_result.st_size